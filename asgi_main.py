@@ -0,0 +1,56 @@
+# asgi_main.py
+# Quart (ASGI) server with the same API routes as main.py, backed by an asyncpg pool
+# Run with: hypercorn -w 4 -b 0.0.0.0:$PORT asgi_main:app
+import asyncio
+import os
+
+from quart import Quart, jsonify, request
+from quart_cors import cors
+from config.async_db import init_db_pool, close_db_pool
+from routes.asgi.users import users_bp
+from routes.asgi.categories import categories_bp
+from routes.asgi.news import news_bp
+from services import metrics
+
+
+app = cors(Quart(__name__), allow_origin="*")
+
+# user
+app.register_blueprint(users_bp, url_prefix="/api/user")
+
+# categories
+app.register_blueprint(categories_bp, url_prefix="/api/categories")
+
+# news
+app.register_blueprint(news_bp, url_prefix="/api/news")
+
+metrics.init_asgi_app(app)  # /metrics and per-route DB timing
+
+
+@app.before_serving
+async def startup():
+    await init_db_pool()
+
+@app.after_serving
+async def shutdown():
+    await close_db_pool()
+
+
+# Home route
+@app.route('/')
+async def home():
+    return "News Aggregator Backend is Live 🚀"
+
+# API to trigger fetching and processing news; the pipeline is synchronous, run it in a thread
+@app.route('/api/fetch-news', methods=['GET'])
+async def fetch_news_route():
+    # Imported lazily so serving the API does not load the model stack
+    from scripts.news_fetcher import fetch_and_process_news
+    await asyncio.to_thread(fetch_and_process_news,
+                            profile=request.args.get("profile") == "1",
+                            force=request.args.get("force") == "1")
+    return jsonify({"message": "Fetched and processed latest news successfully!"})
+
+if __name__ == '__main__':
+    port = int(os.environ.get("PORT", 5000))
+    app.run(host="0.0.0.0", port=port)
@@ -0,0 +1,171 @@
+# benchmarks/bench_ingest.py
+# Offline ingest benchmark: runs fetch_and_process_news against the local fixture server
+#
+#   python -m benchmarks.bench_ingest --feeds 10 --entries 5 --models stub --db standin
+#
+# --db postgres uses the DB_* settings from .env and must point at a throwaway database
+# created from benchmarks/schema.sql and migrations/*.sql: the fetcher walks every row of
+# feed_urls, so the benchmark adds its fixture feeds there and removes them afterwards.
+import argparse
+import contextlib
+import os
+import time
+import types
+from unittest import mock
+
+from benchmarks.common import StageTimer, peak_rss_mb, write_results
+from benchmarks.fixture_server import FixtureServer, FixtureSite
+from benchmarks.standin_db import StandInDatabase, query_text
+from benchmarks import stub_models
+
+# Pipeline helpers timed as stages, by their names in scripts.news_fetcher
+STAGES = {
+    "description_scrape": "clean_description",
+    "article_extraction": "get_article_text",
+    "summarize": "create_summary",
+    "sentiment": "process_sentiment",
+    "ner": "process_entities",
+}
+
+
+class TimedConnection:
+    """Connection proxy that times news inserts and commits as the db_write stage"""
+
+    def __init__(self, conn, timer: StageTimer):
+        self._conn = conn
+        self._timer = timer
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._conn.cursor(*args, **kwargs), self._timer)
+
+    def commit(self):
+        start = time.perf_counter()
+        self._conn.commit()
+        self._timer.record("db_write", time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class TimedCursor:
+    def __init__(self, cur, timer: StageTimer):
+        self._cur = cur
+        self._timer = timer
+
+    def execute(self, query, params=None):
+        start = time.perf_counter()
+        try:
+            return self._cur.execute(query, params)
+        finally:
+            if "INSERT INTO news (" in query_text(query):
+                self._timer.record("db_write", time.perf_counter() - start)
+                self._timer.increment("inserts")
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+
+@contextlib.contextmanager
+def postgres_feeds(feed_urls: list):
+    """Register the fixture feeds in a local Postgres and remove them afterwards"""
+    from config.db import get_db_connection
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT id::text FROM categories LIMIT 1")
+    row = cur.fetchone()
+    if row is None:
+        cur.execute("INSERT INTO categories (title) VALUES ('Benchmark') RETURNING id::text")
+        row = cur.fetchone()
+    cur.executemany(
+        "INSERT INTO feed_urls (feed_url, category_id) VALUES (%s, %s)",
+        [(url, row[0]) for url in feed_urls]
+    )
+    conn.commit()
+    try:
+        yield get_db_connection
+    finally:
+        cur.execute("DELETE FROM feed_urls WHERE feed_url = ANY(%s)", (feed_urls,))
+        conn.commit()
+        cur.close()
+        conn.close()
+
+
+def run(args) -> dict:
+    import feedparser
+    import scripts.news_fetcher as news_fetcher
+
+    timer = StageTimer()
+    site = FixtureSite(args.feeds, args.entries, paragraphs=args.paragraphs)
+
+    with FixtureServer(site) as site, contextlib.ExitStack() as stack:
+        if args.db == "standin":
+            db = StandInDatabase()
+            db.add_feeds(site.feed_urls())
+            connect = db.connect
+        else:
+            connect = stack.enter_context(postgres_feeds(site.feed_urls()))
+
+        patches = {
+            "get_db_connection": lambda: TimedConnection(connect(), timer),
+            "feedparser": types.SimpleNamespace(parse=timer.wrap("feed_fetch", feedparser.parse)),
+        }
+        for stage, name in STAGES.items():
+            patches[name] = timer.wrap(stage, getattr(news_fetcher, name))
+        if args.models == "stub":
+            patches["pipeline"] = stub_models.stub_pipeline
+            patches["BartTokenizer"] = stub_models.StubTokenizer
+        elif args.models == "small":
+            patches["pipeline"] = stub_models.small_pipeline
+            patches["BartTokenizer"] = stub_models.small_tokenizer()
+        patches["pipeline"] = timer.wrap("model_load", patches.get("pipeline", news_fetcher.pipeline))
+
+        stack.enter_context(mock.patch.multiple(news_fetcher, **patches))
+        if not args.verbose:
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+
+        start = time.perf_counter()
+        outcome = news_fetcher.fetch_and_process_news()
+        wall = time.perf_counter() - start
+
+    articles = timer.counters.get("inserts", 0)
+    load_time = sum(timer.samples.get("model_load", []))
+    return {
+        "config": vars(args),
+        "outcome": outcome,
+        "articles": articles,
+        "wall_seconds": round(wall, 3),
+        "articles_per_second": round(articles / (wall - load_time), 2) if wall > load_time else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the news ingest pipeline")
+    parser.add_argument("--feeds", type=int, default=10)
+    parser.add_argument("--entries", type=int, default=5, help="Entries per feed")
+    parser.add_argument("--paragraphs", type=int, default=12, help="Paragraphs per article page")
+    parser.add_argument("--models", choices=["stub", "small", "full"], default="stub")
+    parser.add_argument("--db", choices=["standin", "postgres"], default="standin")
+    parser.add_argument("--output", help="Result file, defaults to benchmarks/results/ingest-<commit>.json")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline's own logging")
+    args = parser.parse_args()
+
+    results = run(args)
+    path = write_results("ingest", results, args.output)
+
+    print(f"📊 {results['articles']} articles in {results['wall_seconds']}s "
+          f"({results['articles_per_second']} articles/s excluding model load), "
+          f"peak RSS {results['peak_rss_mb']} MB")
+    for stage, summary in results["stages"].items():
+        print(f"   {stage:<26} {summary}")
+    print(f"💾 Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
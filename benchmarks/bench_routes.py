@@ -0,0 +1,121 @@
+# benchmarks/bench_routes.py
+# Load-generator benchmark for the feed, preference and category endpoints
+#
+#   python -m benchmarks.bench_routes --db standin --concurrency 20 --duration 10
+#
+# By default the Flask app from main.py is served in-process on a threaded werkzeug
+# server; --url benchmarks an already running deployment (e.g. gunicorn or hypercorn)
+# instead, in which case the target's own database is used.
+import argparse
+import asyncio
+import contextlib
+import os
+import threading
+import uuid
+from unittest import mock
+
+import httpx
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from benchmarks.common import peak_rss_mb, write_results
+from benchmarks.standin_db import StandInDatabase
+from scripts.load_test import run_load
+
+# Modules that bind get_db_connection at import time
+ROUTE_MODULES = (
+    "routes.users.createUser",
+    "routes.users.statusUpdate",
+    "routes.users.preferences",
+    "routes.users.getNews",
+    "routes.categories.fetch_categories",
+)
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+@contextlib.contextmanager
+def local_server(db: str, news_rows: int):
+    """Serve main.app on a free local port, optionally backed by the stand-in database"""
+    with contextlib.ExitStack() as stack:
+        # The routes log every request to stdout, keep that out of the report
+        devnull = stack.enter_context(open(os.devnull, "w"))
+        stack.enter_context(contextlib.redirect_stdout(devnull))
+        from main import app
+
+        if db == "standin":
+            standin = StandInDatabase(news_rows=news_rows)
+            for module in ROUTE_MODULES:
+                stack.enter_context(mock.patch(f"{module}.get_db_connection", standin.connect))
+            # One process, so local invalidation is complete; no LISTEN connection needed
+            from services.users import preference_listener
+            stack.enter_context(mock.patch.multiple(preference_listener, healthy=True,
+                                                    ensure_started=lambda: None))
+
+        server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietRequestHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}"
+        finally:
+            server.shutdown()
+
+
+def prepare(base_url: str) -> tuple:
+    """Create a benchmark user following half of the categories, returns (user_id, followed)"""
+    user_id = f"bench-{uuid.uuid4()}"
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        client.post("/api/user/create-user", json={"userId": user_id}).raise_for_status()
+        categories = client.get("/api/categories/fetch_categories").json()
+        followed = [category["categoryId"] for category in categories][: max(1, len(categories) // 2)]
+        client.patch("/api/user/preference", json={"userId": user_id, "preference": followed}).raise_for_status()
+    return user_id, followed
+
+
+def scenarios(user_id: str, followed: list) -> dict:
+    return {
+        "fetch_news_anonymous": [("POST", "/api/user/fetch-news", {})],
+        "fetch_news_personalised": [("POST", "/api/user/fetch-news", {"userId": user_id})],
+        "preference": [("PATCH", "/api/user/preference", {"userId": user_id, "preference": followed})],
+        "fetch_categories": [("GET", "/api/categories/fetch_categories", None)],
+    }
+
+
+def run(args) -> dict:
+    with contextlib.ExitStack() as stack:
+        base_url = args.url or stack.enter_context(local_server(args.db, args.news_rows))
+        user_id, followed = prepare(base_url)
+
+        endpoints = {}
+        for name, requests in scenarios(user_id, followed).items():
+            endpoints[name] = asyncio.run(run_load(base_url, requests, args.concurrency, args.duration))
+
+    return {
+        "config": vars(args),
+        "target": args.url or f"in-process ({args.db})",
+        "endpoints": endpoints,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark of the user and category endpoints")
+    parser.add_argument("--url", help="Benchmark a running server instead of an in-process one")
+    parser.add_argument("--db", choices=["standin", "postgres"], default="standin")
+    parser.add_argument("--news-rows", type=int, default=1000, help="Rows seeded into the stand-in news table")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per endpoint")
+    parser.add_argument("--output", help="Result file, defaults to benchmarks/results/routes-<commit>.json")
+    args = parser.parse_args()
+
+    results = run(args)
+    for name, result in results["endpoints"].items():
+        print(f"📊 {name:<26} {result['rps']} req/s, p50 {result['p50_ms']} ms, "
+              f"p99 {result['p99_ms']} ms, {result['errors']} errors")
+    print(f"💾 Results written to {write_results('routes', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
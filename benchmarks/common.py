@@ -0,0 +1,89 @@
+# benchmarks/common.py
+# Timing collection and JSON result files shared by the benchmark scripts
+import datetime
+import functools
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class StageTimer:
+    """Collects wall-clock durations per named stage"""
+
+    def __init__(self):
+        self.samples = {}
+        self.counters = {}
+
+    def increment(self, counter: str, amount: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def record(self, stage: str, seconds: float):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage: str, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        return timed
+
+    def summary(self) -> dict:
+        return {stage: latency_summary(samples) for stage, samples in self.samples.items()}
+
+
+def latency_summary(samples: list) -> dict:
+    """count/total/mean/p50/p95/max of durations given in seconds, reported in ms"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    percentile = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "count": len(ordered),
+        "total_ms": round(sum(ordered) * 1000, 2),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(0.50) * 1000, 3),
+        "p95_ms": round(percentile(0.95) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(name: str, results: dict, output: str = None) -> str:
+    """Write results with run metadata to output, by default results/<name>-<commit>.json"""
+    commit = git_commit()
+    document = {
+        "benchmark": name,
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{commit}.json")
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2, default=str)
+    return output
@@ -0,0 +1,128 @@
+# benchmarks/fixture_server.py
+# Local HTTP server for RSS feeds and article pages built from news_data.json
+import datetime
+import email.utils
+import html
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "news_data.json")
+
+# Filler so article pages pass the extractors' minimum-length checks
+BODY_PARAGRAPH = (
+    "Officials said the developments were being closely followed across the region, "
+    "with analysts noting that the outcome could shape policy decisions for months. "
+    "Local residents described the mood as cautious but hopeful, and several groups "
+    "called for more transparency as further details are expected later this week."
+)
+
+
+def load_records(path: str = FIXTURE_PATH) -> list:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+class FixtureSite:
+    """Renders a fixed set of feeds, each with the same recorded entries under unique links"""
+
+    def __init__(self, feeds: int, entries_per_feed: int, paragraphs: int = 12, records: list = None):
+        self.feeds = feeds
+        self.entries_per_feed = entries_per_feed
+        self.paragraphs = paragraphs
+        self.records = records or load_records()
+        self.base_url = None
+
+    def entry(self, feed: int, index: int) -> dict:
+        record = self.records[index % len(self.records)]
+        # Recent enough for the fetcher's two-day window, newest first
+        published = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=5 * index + feed)
+        return {
+            "title": f"{record['title']} ({feed}-{index})",
+            "description": record["description"],
+            "path": f"/articles/{feed}/{index}.html",
+            "published": email.utils.format_datetime(published),
+        }
+
+    def render_feed(self, feed: int) -> str:
+        items = []
+        for index in range(self.entries_per_feed):
+            entry = self.entry(feed, index)
+            items.append(
+                "<item>"
+                f"<title>{html.escape(entry['title'])}</title>"
+                f"<link>{self.base_url}{entry['path']}</link>"
+                f"<description>{html.escape(entry['description'])}</description>"
+                f"<pubDate>{entry['published']}</pubDate>"
+                "</item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0"><channel>'
+            f"<title>Benchmark feed {feed}</title><link>{self.base_url}/</link>"
+            "<description>Offline benchmark fixture</description>"
+            f"{''.join(items)}"
+            "</channel></rss>"
+        )
+
+    def render_article(self, feed: int, index: int) -> str:
+        entry = self.entry(feed, index)
+        body = "".join(f"<p>{entry['description']} {BODY_PARAGRAPH}</p>" for _ in range(self.paragraphs))
+        return (
+            "<html><head>"
+            f"<title>{html.escape(entry['title'])}</title>"
+            f'<meta name="description" content="{html.escape(entry["description"])}">'
+            "</head><body><article>"
+            f"<h1>{html.escape(entry['title'])}</h1>{body}"
+            "</article></body></html>"
+        )
+
+    def feed_urls(self) -> list:
+        return [f"{self.base_url}/feeds/{feed}.xml" for feed in range(self.feeds)]
+
+
+def _handler_for(site: FixtureSite):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            try:
+                if len(parts) == 2 and parts[0] == "feeds":
+                    body, content_type = site.render_feed(int(parts[1].split(".")[0])), "application/rss+xml"
+                elif len(parts) == 3 and parts[0] == "articles":
+                    body, content_type = site.render_article(int(parts[1]), int(parts[2].split(".")[0])), "text/html"
+                else:
+                    raise ValueError(self.path)
+            except ValueError:
+                self.send_error(404)
+                return
+
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+class FixtureServer:
+    """Serves a FixtureSite on 127.0.0.1 from a background thread"""
+
+    def __init__(self, site: FixtureSite, port: int = 0):
+        self.site = site
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _handler_for(site))
+        site.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self.site
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
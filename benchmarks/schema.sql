@@ -0,0 +1,47 @@
+-- benchmarks/schema.sql
+-- Base tables for a local benchmark database, matching the columns the app reads and writes.
+-- Apply this first, then migrations/*.sql in order.
+
+CREATE TABLE IF NOT EXISTS categories (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    title TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS feed_urls (
+    id SERIAL PRIMARY KEY,
+    feed_url TEXT NOT NULL,
+    category_id TEXT
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    "userId" TEXT PRIMARY KEY,
+    "isNew" BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS user_preferences (
+    "userId" TEXT NOT NULL REFERENCES users ("userId") ON DELETE CASCADE,
+    "categoryId" UUID NOT NULL REFERENCES categories (id) ON DELETE CASCADE,
+    PRIMARY KEY ("userId", "categoryId")
+);
+
+CREATE TABLE IF NOT EXISTS news (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    title TEXT,
+    description TEXT,
+    summary TEXT,
+    sentiment_label TEXT,
+    sentiment_score DOUBLE PRECISION,
+    category TEXT,
+    published_at TIMESTAMPTZ,
+    source TEXT,
+    link TEXT UNIQUE,
+    image_url TEXT,
+    persons TEXT,
+    organizations TEXT,
+    locations TEXT,
+    read_time INTEGER,
+    popularity INTEGER NOT NULL DEFAULT 0,
+    "categoryId" TEXT
+);
+
+CREATE INDEX IF NOT EXISTS news_published_at_idx ON news (published_at DESC);
@@ -0,0 +1,248 @@
+# benchmarks/standin_db.py
+# In-memory stand-in for the psycopg2 connections the app opens, answering only the
+# statements the ingest pipeline and the benchmarked routes issue
+import datetime
+import threading
+import uuid
+
+from psycopg2 import sql
+
+from benchmarks.fixture_server import load_records
+
+NEWS_COLUMNS = (
+    "id", "title", "description", "summary", "sentiment_label", "sentiment_score",
+    "category", "published_at", "source", "link", "image_url", "persons",
+    "organizations", "locations", "read_time", "popularity", "views", "clicks",
+    "hot_score", "categoryId",
+)
+
+# Column order of the INSERT in scripts/news_fetcher.py
+INSERT_COLUMNS = (
+    "title", "description", "summary", "sentiment_label", "sentiment_score",
+    "category", "published_at", "source", "link", "image_url", "persons",
+    "organizations", "locations", "read_time", "popularity", "hot_score", "categoryId",
+)
+
+
+def query_text(query) -> str:
+    """Plain SQL text of a str or psycopg2.sql composable, whitespace collapsed"""
+    if isinstance(query, sql.Composed):
+        text = "".join(query_text(part) for part in query.seq)
+    elif isinstance(query, sql.SQL):
+        text = query.string
+    else:
+        text = str(query)
+    return " ".join(text.split())
+
+
+class StandInDatabase:
+    """Shared state behind every StandInConnection"""
+
+    def __init__(self, categories: int = 8, news_rows: int = 0):
+        self.lock = threading.Lock()
+        self.categories = {str(uuid.uuid4()): f"Category {i}" for i in range(categories)}
+        self.feed_urls = []  # (feed_url, category_id, category_title)
+        self.feed_state = {}  # feed_url -> SAVE_STATE_QUERY parameters
+        self.entry_failures = {}  # link -> failed attempts
+        self.feed_version = 1
+        self.news = {}  # link -> row dict
+        self.users = {}  # userId -> isNew
+        self.preferences = {}  # userId -> list of category ids
+        self.statements = 0
+        if news_rows:
+            self.seed_news(news_rows)
+
+    def connect(self, *args, **kwargs):
+        return StandInConnection(self)
+
+    def add_feeds(self, feed_urls: list):
+        category_ids = list(self.categories)
+        for i, url in enumerate(feed_urls):
+            category_id = category_ids[i % len(category_ids)]
+            self.feed_urls.append((url, category_id, self.categories[category_id]))
+
+    def add_user(self, user_id: str, preferences: list = None):
+        self.users[user_id] = True
+        self.preferences[user_id] = list(preferences or [])
+
+    def seed_news(self, count: int):
+        records = load_records()
+        category_ids = list(self.categories)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for i in range(count):
+            record = records[i % len(records)]
+            category_id = category_ids[i % len(category_ids)]
+            link = f"{record['link']}-{i}"
+            self.news[link] = {
+                "id": str(uuid.uuid4()),
+                "title": record["title"],
+                "description": record["description"],
+                "summary": record["description"] * 4,
+                "sentiment_label": "3 stars",
+                "sentiment_score": 0.5,
+                "category": self.categories[category_id],
+                "published_at": now - datetime.timedelta(minutes=i),
+                "source": record["source"],
+                "link": link,
+                "image_url": None,
+                "persons": None,
+                "organizations": None,
+                "locations": None,
+                "read_time": 2,
+                "popularity": i % 50,
+                "views": i % 50,
+                "clicks": 0,
+                "hot_score": float(count - i),
+                "categoryId": category_id,
+            }
+
+
+class StandInCursor:
+    def __init__(self, db: StandInDatabase):
+        self.db = db
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        rows, self._rows = self._rows, []
+        return iter(rows)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+    def _result(self, columns, rows):
+        self.description = [(name,) for name in columns]
+        self._rows = list(rows)
+        self.rowcount = len(self._rows)
+
+    def execute(self, query, params=None):
+        text = query_text(query)
+        db = self.db
+        with db.lock:
+            db.statements += 1
+            if "FROM feed_urls" in text:
+                self._due_feeds()
+            elif text.startswith("INSERT INTO feed_state"):
+                db.feed_state[params["feed_url"]] = dict(params)
+                self._result((), [])
+            elif "FROM feed_entry_failures" in text:
+                self._result(("link", "attempts"),
+                             [(link, db.entry_failures[link]) for link in params[0] if link in db.entry_failures])
+            elif text.startswith("INSERT INTO feed_entry_failures"):
+                db.entry_failures[params["link"]] = db.entry_failures.get(params["link"], 0) + 1
+                self._result(("attempts",), [(db.entry_failures[params["link"]],)])
+            elif text.startswith("DELETE FROM feed_entry_failures"):
+                db.entry_failures.pop(params[0], None)
+                self._result((), [])
+            elif text.startswith("SELECT ensure_news_partitions"):
+                self._result(("ensure_news_partitions",), [(0,)])
+            elif text.startswith("SELECT link FROM news_links"):
+                self._result(("link",), [(link,) for link in params[0] if link in db.news])
+            elif text.startswith("WITH claimed AS"):
+                # params are the claimed (link, published_at), then the news columns
+                row = dict(zip(INSERT_COLUMNS, params[2:]))
+                inserted = row["link"] not in db.news
+                if inserted:
+                    row.update(id=str(uuid.uuid4()), views=0, clicks=0)
+                    db.news[row["link"]] = row
+                self._result((), [])
+                self.rowcount = int(inserted)
+            elif text.startswith("SELECT nextval('news_feed_version')"):
+                db.feed_version += 1
+                self._result(("nextval",), [(db.feed_version,)])
+            elif "FROM news_feed_version" in text:
+                self._feed_version(text, params)
+            elif "FROM news n" in text:
+                self._feed(text, params)
+            elif "FROM user_preferences up JOIN categories" in text:
+                self._result(("id",), [(c,) for c in db.preferences.get(params["user_id"], [])])
+            elif text.startswith("WITH requested AS"):
+                self._set_preferences(params["user_id"], params["preferences"])
+            elif 'AS "categoryId"' in text and "FROM categories" in text:
+                self._result(("categoryId", "categoryName"), db.categories.items())
+            elif "FROM categories" in text:
+                self._result(("id",), [(c,) for c in db.categories])
+            elif text.startswith("INSERT INTO users"):
+                created = params["user_id"] not in db.users
+                db.users.setdefault(params["user_id"], True)
+                self._result(("userId",), [(params["user_id"],)] if created else [])
+            elif text.startswith("WITH target AS"):
+                user_id = params["user_id"]
+                was_new = db.users.get(user_id)
+                if user_id in db.users:
+                    db.users[user_id] = False
+                self._result(("isNew",), [] if was_new is None else [(was_new,)])
+            else:
+                raise NotImplementedError(f"Stand-in database cannot answer: {text[:120]}")
+
+    def _due_feeds(self):
+        # Every feed is due: the stand-in does not track wall-clock poll times
+        rows = []
+        for feed_url, category_id, category_title in self.db.feed_urls:
+            state = self.db.feed_state.get(feed_url, {})
+            rows.append((feed_url, category_id, category_title) + tuple(state.get(column) for column in (
+                "high_water_mark", "publish_interval", "poll_interval", "failures", "etag", "modified"
+            )))
+        self._result(("feed_url", "category_id", "category_title", "high_water_mark",
+                      "publish_interval_seconds", "poll_interval_seconds", "consecutive_failures",
+                      "etag", "modified"), rows)
+
+    def _feed(self, text, params):
+        rows = self.db.news.values()
+        if "ANY(%s)" in text:
+            wanted = set(params[0])
+            rows = [row for row in rows if row["categoryId"] in wanted]
+        key = "hot_score" if "hot_score DESC" in text else "published_at"
+        rows = sorted(rows, key=lambda row: row[key] or 0, reverse=True)[:100]
+        columns = NEWS_COLUMNS + ("category_name",)
+        self._result(columns, [
+            tuple(row.get(c) for c in NEWS_COLUMNS) + (self.db.categories.get(row["categoryId"]),)
+            for row in rows
+        ])
+
+    def _feed_version(self, text, params):
+        rows = self.db.news.values()
+        if "ANY(%s)" in text:
+            wanted = set(params[0])
+            rows = [row for row in rows if row["categoryId"] in wanted]
+        newest = max((row["published_at"] for row in rows if row["published_at"]), default=None)
+        self._result(("last_value", "max"), [(self.db.feed_version, newest)])
+
+    def _set_preferences(self, user_id, preferences):
+        db = self.db
+        invalid = [p for p in preferences if p not in db.categories]
+        exists = user_id in db.users
+        if exists and not invalid:
+            db.preferences[user_id] = list(dict.fromkeys(preferences))
+        self._result(("user_exists", "invalid_ids"), [(exists, invalid)])
+
+
+class StandInConnection:
+    def __init__(self, db: StandInDatabase):
+        self.db = db
+
+    def cursor(self, *args, **kwargs):
+        return StandInCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,64 @@
+# benchmarks/stub_models.py
+# Stand-ins for the transformers pipelines used by scripts/news_fetcher.py
+import re
+
+# Smaller checkpoints with the same task heads, for "--models small"
+SMALL_MODELS = {
+    "facebook/bart-large-cnn": "sshleifer/distilbart-cnn-6-6",
+    "nlptown/bert-base-multilingual-uncased-sentiment": "lxyuan/distilbert-base-multilingual-cased-sentiments-student",
+    "dslim/bert-base-NER": "dslim/distilbert-NER",
+}
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the call/decode surface truncate_text() uses"""
+
+    def __call__(self, text, truncation=True, max_length=1024, return_tensors=None):
+        return {"input_ids": [text.split()[:max_length]]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+    @classmethod
+    def from_pretrained(cls, *args, **kwargs):
+        return cls()
+
+
+def _summarize(text, max_length=None, min_length=None, do_sample=False, **kwargs):
+    return [{"summary_text": " ".join(text.split()[:max_length or 60])}]
+
+
+def _classify(text, **kwargs):
+    return [{"label": "3 stars", "score": 0.5}]
+
+
+_CAPITALISED = re.compile(r"\b[A-Z][a-z]+\b")
+_ENTITY_GROUPS = ("PER", "ORG", "LOC")
+
+
+def _ner(text, **kwargs):
+    words = _CAPITALISED.findall(text)[:9]
+    return [{"entity_group": _ENTITY_GROUPS[i % 3], "word": word} for i, word in enumerate(words)]
+
+
+_STUBS = {"summarization": _summarize, "text-classification": _classify, "ner": _ner}
+
+
+def stub_pipeline(task, model=None, **kwargs):
+    return _STUBS[task]
+
+
+def small_pipeline(task, model=None, **kwargs):
+    from transformers import pipeline
+    return pipeline(task, model=SMALL_MODELS.get(model, model), **kwargs)
+
+
+def small_tokenizer():
+    from transformers import BartTokenizer
+
+    class SmallBartTokenizer:
+        @staticmethod
+        def from_pretrained(name, *args, **kwargs):
+            return BartTokenizer.from_pretrained(SMALL_MODELS.get(name, name), *args, **kwargs)
+
+    return SmallBartTokenizer
@@ -0,0 +1,61 @@
+import asyncpg
+import os
+import time
+from dotenv import load_dotenv
+from quart import g, has_request_context
+
+load_dotenv()
+
+_pool = None
+
+class TimedPool:
+    """asyncpg pool proxy adding each query's time to the current request's database time
+
+    The asyncpg counterpart of config.db.TimedCursor, see services.metrics.init_asgi_app.
+    """
+
+    TIMED = {"execute", "executemany", "fetch", "fetchrow", "fetchval"}
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, name):
+        attr = getattr(self._pool, name)
+        if name not in self.TIMED:
+            return attr
+
+        async def timed(*args, **kwargs):
+            if not has_request_context():
+                return await attr(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                g.db_seconds = g.get("db_seconds", 0.0) + time.perf_counter() - start
+                g.db_statements = g.get("db_statements", 0) + 1
+        return timed
+
+async def init_db_pool():
+    global _pool
+    if _pool is None:
+        _pool = TimedPool(await asyncpg.create_pool(
+            host=os.getenv("DB_HOST"),
+            port=int(os.getenv("DB_PORT", 5432)),
+            database=os.getenv("DB_NAME"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            min_size=int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+            max_size=int(os.getenv("DB_POOL_MAX_SIZE", 10))
+        ))
+    return _pool
+
+def get_db_pool():
+    if _pool is None:
+        raise RuntimeError("Database pool is not initialised, call init_db_pool() at startup")
+    return _pool
+
+async def close_db_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -1,15 +1,32 @@
 import psycopg2
+import psycopg2.extensions
 import os
+import time
 from dotenv import load_dotenv
+from flask import g, has_request_context
 
 load_dotenv()
 
+class TimedCursor(psycopg2.extensions.cursor):
+    """Adds each statement's time to the current request's database time (see services.metrics)"""
+
+    def execute(self, query, vars=None):
+        if not has_request_context():
+            return super().execute(query, vars)
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            g.db_seconds = g.get("db_seconds", 0.0) + time.perf_counter() - start
+            g.db_statements = g.get("db_statements", 0) + 1
+
 def get_db_connection():
     conn = psycopg2.connect(
         host=os.getenv("DB_HOST"),
         port=os.getenv("DB_PORT"),
         database=os.getenv("DB_NAME"),
         user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD")
+        password=os.getenv("DB_PASSWORD"),
+        cursor_factory=TimedCursor
     )
     return conn
@@ -3,7 +3,7 @@
 print("🔥 main.py started")
 import os
 
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS  # 👈 import CORS
 from scripts.news_fetcher import fetch_and_process_news
 from routes.users.createUser import create_user_bp
@@ -11,10 +11,13 @@ from routes.users.statusUpdate import update_status_bp
 from routes.users.preferences import user_preference_bp
 from routes.categories.fetch_categories import fetch_categories_bp
 from routes.users.getNews import fetch_news_bp
+from routes.news.events import news_events_bp
+from services import metrics
 
 
 app = Flask(__name__)
 CORS(app)  # 👈 Enable CORS for all routes
+metrics.init_app(app)  # /metrics and per-route DB timing
 
 # user
 app.register_blueprint(create_user_bp, url_prefix="/api/user")
@@ -26,6 +29,9 @@ app.register_blueprint(fetch_news_bp, url_prefix="/api/user")
 # categories
 app.register_blueprint(fetch_categories_bp, url_prefix="/api/categories")
 
+# news
+app.register_blueprint(news_events_bp, url_prefix="/api/news")
+
 
 # Home route
 @app.route('/')
@@ -35,7 +41,10 @@ def home():
 # API to trigger fetching and processing news
 @app.route('/api/fetch-news', methods=['GET'])
 def fetch_news_route():
-    fetch_and_process_news()
+    # ?profile=1 dumps a flame-graph profile of this run to INGEST_PROFILE_DIR,
+    # ?force=1 polls every feed instead of only the ones that are due
+    fetch_and_process_news(profile=request.args.get("profile") == "1",
+                           force=request.args.get("force") == "1")
     return jsonify({"message": "Fetched and processed latest news successfully!"})
 
 if __name__ == '__main__':
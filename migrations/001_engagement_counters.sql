@@ -0,0 +1,19 @@
+-- 001_engagement_counters.sql
+-- Engagement counters and the decayed popularity score behind the "popular" feed ordering.
+-- hot_score = ln(max(popularity, 1)) + epoch(published_at) / 45000, maintained by
+-- services/engagement.py on every flush and by the ingest insert.
+
+ALTER TABLE news ADD COLUMN IF NOT EXISTS views INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE news ADD COLUMN IF NOT EXISTS clicks INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE news ADD COLUMN IF NOT EXISTS hot_score DOUBLE PRECISION;
+
+UPDATE news
+SET hot_score = LN(GREATEST(popularity, 1)) + EXTRACT(EPOCH FROM published_at) / 45000
+WHERE hot_score IS NULL;
+
+-- Column order and NULLS LAST match the "popular" ORDER BY, so the feed reads the index in
+-- order instead of sorting. Dropped first to replace the plain (hot_score DESC) versions.
+DROP INDEX IF EXISTS news_hot_score_idx;
+DROP INDEX IF EXISTS news_category_hot_score_idx;
+CREATE INDEX news_hot_score_idx ON news (hot_score DESC NULLS LAST, published_at DESC);
+CREATE INDEX news_category_hot_score_idx ON news ("categoryId", hot_score DESC NULLS LAST, published_at DESC);
@@ -0,0 +1,26 @@
+-- 002_feed_state.sql
+-- Per-feed polling state used by services/feed_schedule.py.
+
+CREATE TABLE IF NOT EXISTS feed_state (
+    feed_url TEXT PRIMARY KEY,
+    high_water_mark TIMESTAMPTZ,
+    publish_interval_seconds DOUBLE PRECISION,
+    poll_interval_seconds DOUBLE PRECISION NOT NULL,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    etag TEXT,
+    modified TEXT,
+    last_polled_at TIMESTAMPTZ,
+    next_poll_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS feed_state_next_poll_at_idx ON feed_state (next_poll_at);
+
+-- Feed entries whose processing failed, by link. After MAX_ENTRY_ATTEMPTS failures an entry
+-- is given up so it no longer holds back the feed's high-water mark and validators.
+CREATE TABLE IF NOT EXISTS feed_entry_failures (
+    link TEXT PRIMARY KEY,
+    feed_url TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    last_error TEXT,
+    last_failed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,92 @@
+-- 003_partition_news.sql
+-- Convert news into a table range-partitioned by month on published_at.
+--
+-- A unique index on a partitioned table must include the partition key, so
+-- ON CONFLICT (link) can no longer be enforced by news itself. news_links is the
+-- global dedup registry: the ingest insert claims the link there first, in the
+-- same statement. Old partitions are moved, not copied, to news_archive by
+-- scripts/manage_partitions.py.
+--
+-- The old table is kept as news_unpartitioned; drop it once the copy is verified.
+-- Rows without a published_at cannot be routed to a partition and stay behind there.
+
+BEGIN;
+
+ALTER TABLE news RENAME TO news_unpartitioned;
+ALTER INDEX IF EXISTS news_pkey RENAME TO news_unpartitioned_pkey;
+ALTER INDEX IF EXISTS news_link_key RENAME TO news_unpartitioned_link_key;
+ALTER INDEX IF EXISTS news_published_at_idx RENAME TO news_unpartitioned_published_at_idx;
+ALTER INDEX IF EXISTS news_hot_score_idx RENAME TO news_unpartitioned_hot_score_idx;
+ALTER INDEX IF EXISTS news_category_hot_score_idx RENAME TO news_unpartitioned_category_hot_score_idx;
+
+CREATE TABLE news (LIKE news_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (published_at);
+ALTER TABLE news ALTER COLUMN published_at SET NOT NULL;
+ALTER TABLE news ADD PRIMARY KEY (id, published_at);
+
+CREATE TABLE news_default PARTITION OF news DEFAULT;
+
+CREATE INDEX news_published_at_idx ON news (published_at DESC);
+CREATE INDEX news_category_published_at_idx ON news ("categoryId", published_at DESC);
+CREATE INDEX news_hot_score_idx ON news (hot_score DESC NULLS LAST, published_at DESC);
+CREATE INDEX news_category_hot_score_idx ON news ("categoryId", hot_score DESC NULLS LAST, published_at DESC);
+
+CREATE TABLE news_links (
+    link TEXT PRIMARY KEY,
+    published_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE TABLE news_archive (LIKE news INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (published_at);
+ALTER TABLE news_archive ADD PRIMARY KEY (id, published_at);
+
+-- Creates the monthly partitions of news from from_month through months_ahead months
+-- after the current one; existing partitions are left alone. Rows of the month that already
+-- sit in news_default (e.g. articles dated ahead of the pre-created window) are moved into
+-- the new partition, CREATE TABLE ... PARTITION OF would fail on them.
+CREATE OR REPLACE FUNCTION ensure_news_partitions(from_month DATE, months_ahead INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    month DATE := date_trunc('month', from_month)::date;
+    last_month DATE := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+    next_month DATE;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month <= last_month LOOP
+        partition_name := format('news_p%s', to_char(month, 'YYYYMM'));
+        next_month := (month + interval '1 month')::date;
+        -- Archived months still exist (attached to news_archive) and are not recreated
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE news INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name
+            );
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM news_default WHERE published_at >= %L AND published_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                month, next_month, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE news ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month, next_month
+            );
+            created := created + 1;
+        END IF;
+        month := next_month;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_news_partitions(
+    COALESCE((SELECT min(published_at) FROM news_unpartitioned), now())::date, 2
+);
+
+INSERT INTO news
+SELECT * FROM news_unpartitioned
+WHERE published_at IS NOT NULL;
+
+INSERT INTO news_links (link, published_at)
+SELECT link, published_at FROM news
+WHERE link IS NOT NULL
+ON CONFLICT (link) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,6 @@
+-- 004_feed_version.sql
+-- Version counter behind the feed ETag (services/feed_version.py). Every write that changes
+-- rows served by the feed bumps it in the same transaction: the ingest insert and the
+-- engagement flush. A conditional GET of the feed compares it before running the feed query.
+
+CREATE SEQUENCE IF NOT EXISTS news_feed_version;
@@ -0,0 +1,17 @@
+# Async version of the routes/categories blueprint
+from quart import Blueprint, jsonify
+from config.async_db import get_db_pool
+from routes.asgi.common import json_response, records_to_dicts
+
+categories_bp = Blueprint("categories_async", __name__)
+
+@categories_bp.route("/fetch_categories", methods=["GET"])
+async def fetch_categories():
+    try:
+        pool = get_db_pool()
+        records = await pool.fetch('SELECT id AS "categoryId", title AS "categoryName" FROM categories')
+        return json_response(records_to_dicts(records))
+
+    except Exception as e:
+        print("Fetch Categories Error:", str(e))
+        return jsonify({"success": False, "message": "An unexpected error occurred."}), 500
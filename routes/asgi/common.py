@@ -0,0 +1,20 @@
+# Helpers shared by the ASGI (Quart) blueprints
+from quart import Response, request
+from services.responses import render_json, render_not_modified
+
+
+def json_response(payload, status: int = 200, validator: str = None) -> Response:
+    """Quart counterpart of services.responses.json_response"""
+    body, status, headers = render_json(payload, status, request.accept_encodings, request.if_none_match,
+                                        request.method, validator)
+    return Response(body, status=status, headers=headers)
+
+
+def not_modified_response(validator: str):
+    """Quart counterpart of services.responses.not_modified_response"""
+    rendered = render_not_modified(validator, request.accept_encodings, request.if_none_match, request.method)
+    return Response(rendered[0], status=304, headers=rendered[2]) if rendered else None
+
+
+def records_to_dicts(records) -> list:
+    return [dict(record) for record in records]
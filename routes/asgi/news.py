@@ -0,0 +1,23 @@
+# Async version of the routes/news blueprint
+import asyncio
+
+from quart import Blueprint, request, jsonify
+from services.engagement import engagement_buffer, parse_events
+
+news_bp = Blueprint("news_async", __name__)
+
+@news_bp.route("/events", methods=["POST"])
+async def track_events():
+    try:
+        batch, error = parse_events(await request.get_json())
+        if error:
+            return jsonify({"success": False, "message": error}), 400
+
+        # add() may flush inline once the buffer is full, keep that off the event loop
+        accepted = await asyncio.to_thread(engagement_buffer.add, batch)
+
+        return jsonify({"success": True, "accepted": accepted}), 202
+
+    except Exception as e:
+        print("Track Events Error:", str(e))
+        return jsonify({"success": False, "message": "An unexpected error occurred."}), 500
@@ -0,0 +1,257 @@
+# Async versions of the routes/users blueprints, same URLs and payloads
+import asyncio
+import time
+import uuid
+
+from quart import Blueprint, request, jsonify
+from config.async_db import get_db_pool
+from routes.asgi.common import json_response, not_modified_response, records_to_dicts
+from routes.users.preferences import is_valid_uuid
+from services import users as user_service
+from services.feed_version import FEED_VERSION_QUERY, feed_validator
+from services.partitions import FEED_WINDOW_PREDICATE
+from services.users import preference_cache, category_cache
+
+users_bp = Blueprint("users_async", __name__)
+
+ORDER_BY = {
+    "latest": "n.published_at DESC",
+    "popular": "n.hot_score DESC NULLS LAST, n.published_at DESC",
+}
+
+FEED_QUERY = """
+    SELECT n.*, c.title as category_name
+    FROM news n
+    LEFT JOIN categories c ON n."categoryId" = CAST(c.id AS TEXT)
+    WHERE {window}{where}
+    ORDER BY {order_by}
+    LIMIT 100
+"""
+
+# The service statements rendered with asyncpg placeholders ($1 = user_id, $2 = preferences)
+CREATE_USER_QUERY = user_service.render_query(user_service.CREATE_USER_QUERY, "asyncpg")
+UPDATE_STATUS_QUERY = user_service.render_query(user_service.UPDATE_STATUS_QUERY, "asyncpg")
+SET_PREFERENCES_QUERY = user_service.render_query(user_service.SET_PREFERENCES_QUERY, "asyncpg")
+USER_PREFERENCES_QUERY = user_service.render_query(user_service.USER_PREFERENCES_QUERY, "asyncpg")
+CATEGORY_IDS_QUERY = user_service.render_query(user_service.CATEGORY_IDS_QUERY, "asyncpg")
+
+# The unfiltered feed is the same for every user, so it is shared for a few seconds
+GLOBAL_FEED_TTL = 5.0
+_global_feed_cache = {}  # (sort, validator) -> (expires_at, task)
+
+
+async def _load_global_feed(sort: str) -> list:
+    pool = get_db_pool()
+    records = await pool.fetch(FEED_QUERY.format(window=FEED_WINDOW_PREDICATE, where="", order_by=ORDER_BY[sort]))
+    return records_to_dicts(records)
+
+
+def _reusable(task: asyncio.Future) -> bool:
+    return not task.done() or not (task.cancelled() or task.exception())
+
+
+def global_feed(sort: str, validator: str = None) -> asyncio.Future:
+    """Cached global feed; concurrent callers await the same in-flight query
+
+    Each caller gets its own shield, so a disconnecting client cannot cancel the query for the rest.
+    A GET passes the validator it read first, so a feed cached before the last write is never
+    sent under a newer ETag.
+    """
+    now = time.monotonic()
+    key = (sort, validator)
+    cached = _global_feed_cache.get(key)
+    if cached and cached[0] > now and _reusable(cached[1]):
+        return asyncio.shield(cached[1])
+    # Validators change with every write, drop the entries they left behind
+    for stale in [k for k, (expires_at, _) in _global_feed_cache.items() if expires_at <= now]:
+        del _global_feed_cache[stale]
+    task = asyncio.ensure_future(_load_global_feed(sort))
+    _global_feed_cache[key] = (now + GLOBAL_FEED_TTL, task)
+    return asyncio.shield(task)
+
+
+async def preference_ids(pool, user_id: str) -> list:
+    category_ids, generation = user_service.cached_preference_ids(user_id)
+    if category_ids is None:
+        rows = await pool.fetch(USER_PREFERENCES_QUERY, user_id)
+        category_ids = [row[0] for row in rows]
+        if generation is not None:
+            preference_cache.set(user_id, category_ids, generation)
+    return category_ids
+
+
+async def known_category_ids(pool, refresh: bool = False) -> frozenset:
+    if refresh:
+        category_cache.invalidate()
+    ids = category_cache.get("all")
+    if ids is None:
+        ids = frozenset(row[0] for row in await pool.fetch(CATEGORY_IDS_QUERY))
+        category_cache.set("all", ids)
+    return ids
+
+
+@users_bp.route("/create-user", methods=["POST"])
+async def create_user():
+    try:
+        data = await request.get_json()
+        user_id = data.get("userId")
+
+        pool = get_db_pool()
+        created = await pool.fetchrow(CREATE_USER_QUERY, user_id)
+
+        if created is None:
+            return jsonify({
+                "success": False,
+                "message": "User already exists"
+            }), 400
+
+        return jsonify({
+            "success": True,
+            "message": "User registered successfully"
+        }), 200
+
+    except Exception as e:
+        print("User creation error:", str(e))
+        return jsonify({
+            "success": False,
+            "message": "An unexpected error occurred.",
+            "error": str(e)
+        }), 500
+
+
+@users_bp.route("/update-status", methods=["PATCH"])
+async def update_user_status():
+    try:
+        data = await request.get_json()
+        user_id = data.get("userId")
+
+        pool = get_db_pool()
+        result = await pool.fetchrow(UPDATE_STATUS_QUERY, user_id)
+
+        if result is None:
+            return jsonify({"success": False, "message": "User not found."}), 404
+
+        message = "Status updated." if result[0] else "User is not new."
+
+        return jsonify({"success": True, "message": message}), 200
+
+    except Exception as e:
+        print("Update Status Error:", str(e))
+        return jsonify({"success": False, "message": "Unexpected error"}), 500
+
+
+@users_bp.route("/preference", methods=["PATCH"])
+async def update_user_preference():
+    try:
+        data = await request.get_json()
+        user_id = data.get("userId")
+        new_preferences = data.get("preference")  # Expecting a list of categoryIds
+
+        # Validate input
+        if not user_id or not isinstance(new_preferences, list):
+            return jsonify({"success": False, "message": "Invalid input: userId and preference (list) are required"}), 400
+
+        invalid_categories = [cat for cat in new_preferences if not is_valid_uuid(cat)]
+        if invalid_categories:
+            return jsonify({"success": False, "message": f"Invalid category IDs: {invalid_categories}"}), 400
+
+        new_preferences = [str(uuid.UUID(cat)) for cat in new_preferences]
+
+        pool = get_db_pool()
+        invalid_categories = set(new_preferences) - await known_category_ids(pool)
+        if invalid_categories:
+            invalid_categories = set(new_preferences) - await known_category_ids(pool, refresh=True)
+        if invalid_categories:
+            return jsonify({"success": False, "message": f"Invalid category IDs: {invalid_categories}"}), 400
+
+        user_exists, invalid_ids = await pool.fetchrow(SET_PREFERENCES_QUERY, user_id, new_preferences)
+        preference_cache.invalidate(user_id)
+
+        if not user_exists:
+            return jsonify({"success": False, "message": "User not found"}), 404
+
+        if invalid_ids:
+            category_cache.invalidate()
+            return jsonify({"success": False, "message": f"Invalid category IDs: {set(invalid_ids)}"}), 400
+
+        return jsonify({"success": True, "message": "Preferences updated successfully"}), 200
+
+    except Exception as e:
+        print("Update Preference Error:", str(e))
+        return jsonify({"success": False, "message": "An unexpected error occurred."}), 500
+
+
+@users_bp.route("/fetch-news", methods=["GET", "POST"])
+async def fetch_news():
+    try:
+        # GET takes userId and sort as query parameters so clients can poll with If-None-Match
+        data = request.args if request.method == "GET" else await request.get_json()
+        user_id = data.get("userId")
+        sort = data.get("sort", "latest")
+
+        if sort not in ORDER_BY:
+            return jsonify({
+                "success": False,
+                "message": f"Invalid sort: expected one of {list(ORDER_BY)}"
+            }), 400
+
+        pool = get_db_pool()
+        category_ids = None
+        validator = None
+
+        # A conditional GET is answered from the feed version before the feed query runs
+        if request.method == "GET":
+            category_ids = await preference_ids(pool, user_id) if user_id else None
+            if category_ids:
+                row = await pool.fetchrow(FEED_VERSION_QUERY.format(where=' AND n."categoryId" = ANY($1::text[])'),
+                                          category_ids)
+            else:
+                row = await pool.fetchrow(FEED_VERSION_QUERY.format(where=""))
+            validator = feed_validator(*row, sort, category_ids)
+            not_modified = not_modified_response(validator)
+            if not_modified:
+                return not_modified
+
+        if not user_id:
+            news_list = await global_feed(sort, validator)
+            return json_response({
+                "success": True,
+                "news": news_list,
+                "count": len(news_list),
+                "message": "No userId provided, returning all news"
+            }, validator=validator)
+
+        if category_ids is None:
+            # The preference lookup and the global feed are independent, run them together
+            category_ids, all_news = await asyncio.gather(preference_ids(pool, user_id), global_feed(sort))
+        elif not category_ids:
+            all_news = await global_feed(sort, validator)
+
+        if not category_ids:
+            return json_response({
+                "success": True,
+                "news": all_news,
+                "count": len(all_news),
+                "message": "No preferences set for user, returning all news"
+            }, validator=validator)
+
+        records = await pool.fetch(
+            FEED_QUERY.format(window=FEED_WINDOW_PREDICATE, where=' AND n."categoryId" = ANY($1::text[])',
+                              order_by=ORDER_BY[sort]),
+            category_ids
+        )
+        news_list = records_to_dicts(records)
+
+        return json_response({
+            "success": True,
+            "news": news_list,
+            "count": len(news_list)
+        }, validator=validator)
+
+    except Exception as e:
+        print("Get News Error:", str(e))
+        return jsonify({
+            "success": False,
+            "message": "An unexpected error occurred",
+            "error": str(e)
+        }), 500
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from config.db import get_db_connection
-import psycopg2.extras
+from services.responses import fetch_rows, json_response
 
 fetch_categories_bp = Blueprint("fetch_categories", __name__)
 
@@ -9,25 +9,16 @@ def fetch_categories():
     try:
         print("Fetching categories...")
         conn = get_db_connection()
-        
-        # Use RealDictCursor to get rows as dictionaries
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cur = conn.cursor()
 
-        cur.execute('SELECT id, title FROM categories')
-        categories = cur.fetchall()
-
-        # categories is already a list of dictionaries
-        categories_list = []
-        for category in categories:
-            categories_list.append({
-                "categoryId": category["id"],
-                "categoryName": category["title"]
-            })
+        # Alias the columns to the response keys so rows serialize as-is
+        cur.execute('SELECT id AS "categoryId", title AS "categoryName" FROM categories')
+        categories_list = fetch_rows(cur)
 
         cur.close()
         conn.close()
 
-        return jsonify(categories_list), 200
+        return json_response(categories_list)
 
     except Exception as e:
         print("Fetch Categories Error:", str(e))
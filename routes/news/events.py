@@ -0,0 +1,21 @@
+from flask import Blueprint, request, jsonify
+from services.engagement import engagement_buffer, parse_events
+
+news_events_bp = Blueprint("news_events", __name__)
+
+@news_events_bp.route("/events", methods=["POST"])
+def track_events():
+    try:
+        # Validate input
+        batch, error = parse_events(request.get_json())
+        if error:
+            return jsonify({"success": False, "message": error}), 400
+
+        # 📥 Buffer only; counters are written by the periodic bulk flush
+        accepted = engagement_buffer.add(batch)
+
+        return jsonify({"success": True, "accepted": accepted}), 202
+
+    except Exception as e:
+        print("Track Events Error:", str(e))
+        return jsonify({"success": False, "message": "An unexpected error occurred."}), 500
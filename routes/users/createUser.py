@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from config.db import get_db_connection
+from services.users import create_user as insert_user
 
 create_user_bp = Blueprint("create_user", __name__)  
 
@@ -10,25 +11,17 @@ def create_user():
         user_id = data.get("userId")
 
         conn = get_db_connection()
-        cur = conn.cursor()
 
-        # 🔍 Check if user already exists
-        cur.execute('SELECT * FROM users WHERE "userId" = %s', (user_id,))
-        existing_user = cur.fetchone()
+        # 📝 Insert new user, ON CONFLICT tells us if it already existed
+        created = insert_user(conn, user_id)
+        conn.close()
 
-        if existing_user:
+        if not created:
             return jsonify({
                 "success": False,
                 "message": "User already exists"
             }), 400
 
-        # 📝 Insert new user
-        cur.execute('INSERT INTO users ("userId") VALUES (%s)', (user_id,))
-        conn.commit()
-
-        cur.close()
-        conn.close()
-
         return jsonify({
             "success": True,
             "message": "User registered successfully"
@@ -1,95 +1,117 @@
 from flask import Blueprint, request, jsonify
 from config.db import get_db_connection
 from psycopg2 import sql
+from services.feed_version import FEED_VERSION_QUERY, feed_validator
+from services.partitions import FEED_WINDOW_PREDICATE
+from services.responses import fetch_rows, json_response, not_modified_response
+from services.users import get_user_preference_ids
 
 fetch_news_bp = Blueprint("fetch_news", __name__)
 
-@fetch_news_bp.route("/fetch-news", methods=["POST"])
+# Supported feed orderings, "popular" is backed by the hot_score indexes
+ORDER_BY = {
+    "latest": sql.SQL("n.published_at DESC"),
+    "popular": sql.SQL("n.hot_score DESC NULLS LAST, n.published_at DESC"),
+}
+# Restricts feeds to the newest news partitions
+FEED_WINDOW = sql.SQL(FEED_WINDOW_PREDICATE)
+
+@fetch_news_bp.route("/fetch-news", methods=["GET", "POST"])
 def fetch_news():
     try:
-        data = request.get_json()
+        # GET takes userId and sort as query parameters so clients can poll with If-None-Match
+        data = request.args if request.method == "GET" else request.get_json()
         user_id = data.get("userId")
+        sort = data.get("sort", "latest")
+
+        if sort not in ORDER_BY:
+            return jsonify({
+                "success": False,
+                "message": f"Invalid sort: expected one of {list(ORDER_BY)}"
+            }), 400
+        order_by = ORDER_BY[sort]
 
         conn = get_db_connection()
         cur = conn.cursor()
 
+        # Step 1: Check for user preferences (cached, invalidated on preference updates)
+        category_ids = get_user_preference_ids(conn, user_id) if user_id else None
+
+        # A conditional GET is answered from the feed version before the feed query runs
+        validator = None
+        if request.method == "GET":
+            if category_ids:
+                cur.execute(sql.SQL(FEED_VERSION_QUERY).format(where=sql.SQL(' AND n."categoryId" = ANY(%s)')),
+                            (category_ids,))
+            else:
+                cur.execute(sql.SQL(FEED_VERSION_QUERY).format(where=sql.SQL("")))
+            validator = feed_validator(*cur.fetchone(), sort, category_ids)
+            not_modified = not_modified_response(validator)
+            if not_modified:
+                return not_modified
+
         if not user_id:
             # No userId: Fetch all news without category filter
-            cur.execute("""
+            cur.execute(sql.SQL("""
                 SELECT n.*, c.title as category_name
                 FROM news n
                 LEFT JOIN categories c ON n."categoryId" = CAST(c.id AS TEXT)
-                ORDER BY n.published_at DESC
+                WHERE {window}
+                ORDER BY {order_by}
                 LIMIT 100
-            """)
-            news_data = cur.fetchall()
-            column_names = [desc[0] for desc in cur.description]
-            news_list = [dict(zip(column_names, row)) for row in news_data]
+            """).format(window=FEED_WINDOW, order_by=order_by))
+            news_list = fetch_rows(cur)
 
             cur.close()
             conn.close()
-            return jsonify({
+            return json_response({
                 "success": True,
                 "news": news_list,
                 "count": len(news_list),
                 "message": "No userId provided, returning all news"
-            }), 200
-
-        # Step 1: Check for user preferences
-        cur.execute("""
-            SELECT c.id as category_id, c.title as category_name 
-            FROM user_preferences up
-            JOIN categories c ON up."categoryId" = c.id
-            WHERE up."userId" = %s
-        """, (user_id,))
-        preferences = cur.fetchall()
+            }, validator=validator)
 
-        if not preferences:
+        if not category_ids:
             # Valid userId but no preferences: Fetch all news
-            cur.execute("""
+            cur.execute(sql.SQL("""
                 SELECT n.*, c.title as category_name
                 FROM news n
                 LEFT JOIN categories c ON n."categoryId" = CAST(c.id AS TEXT)
-                ORDER BY n.published_at DESC
+                WHERE {window}
+                ORDER BY {order_by}
                 LIMIT 100
-            """)
-            news_data = cur.fetchall()
-            column_names = [desc[0] for desc in cur.description]
-            news_list = [dict(zip(column_names, row)) for row in news_data]
+            """).format(window=FEED_WINDOW, order_by=order_by))
+            news_list = fetch_rows(cur)
 
             cur.close()
             conn.close()
-            return jsonify({
+            return json_response({
                 "success": True,
                 "news": news_list,
                 "count": len(news_list),
                 "message": "No preferences set for user, returning all news"
-            }), 200
+            }, validator=validator)
 
         # Step 2: Fetch news based on user preferences
-        category_ids = [str(pref[0]) for pref in preferences]  # Convert UUIDs to strings
-
-        cur.execute("""
+        cur.execute(sql.SQL("""
             SELECT n.*, c.title as category_name 
             FROM news n
             LEFT JOIN categories c ON n."categoryId" = CAST(c.id AS TEXT)
-            WHERE n."categoryId" = ANY(%s)
-            ORDER BY n.published_at DESC
+            WHERE n."categoryId" = ANY(%s) AND {window}
+            ORDER BY {order_by}
             LIMIT 100
-        """, (category_ids,))
+        """).format(window=FEED_WINDOW, order_by=order_by), (category_ids,))
         
-        news_data = cur.fetchall()
-        column_names = [desc[0] for desc in cur.description]
-        news_list = [dict(zip(column_names, row)) for row in news_data]
+        news_list = fetch_rows(cur)
 
         cur.close()
         conn.close()
 
-        return jsonify({
+        return json_response({
             "success": True,
             "news": news_list,
             "count": len(news_list)
-        }), 200
+        }, validator=validator)
 
     except Exception as e:
         print("Get News Error:", str(e))
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from config.db import get_db_connection
+from services.users import set_user_preferences, get_category_ids, category_cache
 import uuid
 
 user_preference_bp = Blueprint("preference", __name__)
@@ -31,51 +32,38 @@ def update_user_preference():
             print(f"Invalid category IDs: {invalid_categories}")
             return jsonify({"success": False, "message": f"Invalid category IDs: {invalid_categories}"}), 400
 
+        # Normalise so IDs compare equal to the ones Postgres returns
+        new_preferences = [str(uuid.UUID(cat)) for cat in new_preferences]
+
         conn = get_db_connection()
-        cur = conn.cursor()
 
-        # Step 1: Check if user exists
-        # No UUID casting for userId (assuming userId is now text)
-        print(f"Checking user existence for userId: {user_id}")
-        cur.execute('SELECT * FROM users WHERE "userId" = %s', (user_id,))
-        if not cur.fetchone():
-            cur.close()
+        # Step 1: Reject unknown categories against the cached category set
+        invalid_categories = set(new_preferences) - get_category_ids(conn)
+        if invalid_categories:
+            # The category may be newer than the cache, refresh once before rejecting
+            category_cache.invalidate()
+            invalid_categories = set(new_preferences) - get_category_ids(conn)
+        if invalid_categories:
             conn.close()
-            print(f"User not found: {user_id}")
-            return jsonify({"success": False, "message": "User not found"}), 404
+            print(f"Invalid category IDs: {invalid_categories}")
+            return jsonify({"success": False, "message": f"Invalid category IDs: {invalid_categories}"}), 400
 
-        # Step 2: Validate category IDs (ensure they exist in categories table)
-        if new_preferences:  # Only validate if the list is not empty
-            print(f"Validating category IDs: {new_preferences}")
-            cur.execute('SELECT id FROM categories WHERE id = ANY(%s::uuid[])', (new_preferences,))
-            valid_categories = set(row[0] for row in cur.fetchall())
-            invalid_categories = set(new_preferences) - valid_categories
-            if invalid_categories:
-                cur.close()
-                conn.close()
-                print(f"Invalid category IDs: {invalid_categories}")
-                return jsonify({"success": False, "message": f"Invalid category IDs: {invalid_categories}"}), 400
+        # Step 2: Check the user and apply the preference diff in one statement
+        user_exists, invalid_ids = set_user_preferences(conn, user_id, new_preferences)
+        conn.close()
 
-        # Step 3: Delete all existing preferences for the user
-        # No UUID casting for userId (assuming userId is now text)
-        cur.execute('DELETE FROM user_preferences WHERE "userId" = %s', (user_id,))
-        print(f"Deleted existing preferences for user: {user_id}")
+        if not user_exists:
+            print(f"User not found: {user_id}")
+            return jsonify({"success": False, "message": "User not found"}), 404
 
-        # Step 4: Insert new preferences (if any)
-        if new_preferences:
-            for category_id in new_preferences:
-                # Keep UUID casting for categoryId
-                cur.execute(
-                    'INSERT INTO user_preferences ("userId", "categoryId") VALUES (%s, %s::uuid)',
-                    (user_id, category_id)
-                )
-            print(f"Added new preferences for user {user_id}: {new_preferences}")
-        else:
-            print(f"No new preferences to add for user {user_id} (cleared preferences)")
+        if invalid_ids:
+            # A category was removed since the cache was filled
+            category_cache.invalidate()
+            invalid_categories = set(invalid_ids)
+            print(f"Invalid category IDs: {invalid_categories}")
+            return jsonify({"success": False, "message": f"Invalid category IDs: {invalid_categories}"}), 400
 
-        conn.commit()
-        cur.close()
-        conn.close()
+        print(f"Updated preferences for user {user_id}: {new_preferences}")
 
         return jsonify({"success": True, "message": "Preferences updated successfully"}), 200
 
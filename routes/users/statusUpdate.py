@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from config.db import get_db_connection
+from services.users import mark_user_not_new
 
 update_status_bp = Blueprint("update_status", __name__)  
 
@@ -10,25 +11,13 @@ def update_user_status():
         user_id = data.get("userId")
 
         conn = get_db_connection()
-        cur = conn.cursor()
-
-        cur.execute('SELECT "isNew" FROM users WHERE "userId" = %s', (user_id,))
-        result = cur.fetchone()
+        was_new = mark_user_not_new(conn, user_id)
+        conn.close()
 
-        if result is None:
+        if was_new is None:
             return jsonify({"success": False, "message": "User not found."}), 404
 
-        is_new = result[0]
-
-        if is_new:
-            cur.execute('UPDATE users SET "isNew" = FALSE WHERE "userId" = %s', (user_id,))
-            conn.commit()
-            message = "Status updated."
-        else:
-            message = "User is not new."
-
-        cur.close()
-        conn.close()
+        message = "Status updated." if was_new else "User is not new."
 
         return jsonify({"success": True, "message": message}), 200
 
@@ -0,0 +1,88 @@
+# scripts/load_test.py
+# Compare request throughput of the WSGI (main.py) and ASGI (asgi_main.py) deployments.
+#
+# Start both servers with the same worker count, e.g.
+#   gunicorn -w 4 -b 127.0.0.1:8000 main:app
+#   hypercorn -w 4 -b 127.0.0.1:8001 asgi_main:app
+# then run
+#   python -m scripts.load_test http://127.0.0.1:8000 http://127.0.0.1:8001 --user-id <userId> \
+#       --output benchmarks/results/load-<label>.json
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def build_requests(user_id: str) -> list:
+    requests = [
+        ("POST", "/api/user/fetch-news", {}),
+        ("GET", "/api/categories/fetch_categories", None),
+    ]
+    if user_id:
+        requests.append(("POST", "/api/user/fetch-news", {"userId": user_id}))
+    return requests
+
+
+async def run_load(base_url: str, requests: list, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(client: httpx.AsyncClient, offset: int):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < deadline:
+            method, path, body = requests[i % len(requests)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await asyncio.gather(*(worker(client, n) for n in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "url": base_url,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput comparison of two deployments")
+    parser.add_argument("urls", nargs="+", help="Base URLs to load, e.g. the WSGI then the ASGI server")
+    parser.add_argument("--user-id", default="", help="Existing userId for the personalised feed")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--output", help="Also write the results, with run metadata, to this JSON file")
+    args = parser.parse_args()
+
+    requests = build_requests(args.user_id)
+    results = [asyncio.run(run_load(url, requests, args.concurrency, args.duration)) for url in args.urls]
+
+    for result in results:
+        print(f"📊 {result['url']}: {result['rps']} req/s, p50 {result['p50_ms']} ms, "
+              f"p99 {result['p99_ms']} ms, {result['errors']} errors")
+    if len(results) > 1 and results[0]["rps"]:
+        print(f"🚀 Throughput ratio: {results[-1]['rps'] / results[0]['rps']:.2f}x")
+    if args.output:
+        from benchmarks.common import write_results
+        config = {key: value for key, value in vars(args).items() if key != "output"}
+        print(f"💾 Results written to {write_results('load', {'config': config, 'results': results}, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
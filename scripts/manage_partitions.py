@@ -0,0 +1,41 @@
+# scripts/manage_partitions.py
+# Keep the monthly news partitions ahead of the calendar and archive the old ones.
+# Run it daily (cron or any scheduler), e.g.
+#   python -m scripts.manage_partitions --months-ahead 2 --retain-months 3
+import argparse
+
+from config.db import get_db_connection
+from services.partitions import archive_partitions, ensure_partitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create upcoming news partitions and archive old ones")
+    parser.add_argument("--months-ahead", type=int, default=2, help="Months of partitions created in advance")
+    parser.add_argument("--retain-months", type=int, default=3,
+                        help="Full months kept in news before their partitions move to news_archive "
+                             "(rows in news_default are never archived)")
+    parser.add_argument("--dry-run", action="store_true", help="Roll back instead of committing")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        created = ensure_partitions(cur, args.months_ahead)
+        archived = archive_partitions(cur, args.retain_months)
+        if args.dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+        print(f"🗂️ Created {created} partitions, archived {len(archived)}: {', '.join(archived) or 'none'}"
+              f"{' (dry run)' if args.dry_run else ''}")
+    except Exception as e:
+        conn.rollback()
+        print(f"💥 Partition maintenance failed: {e}")
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
 import feedparser
 import datetime
+import os
 import re
 import requests
 from bs4 import BeautifulSoup
 from config.db import get_db_connection
+from services.engagement import hot_score
+from services.feed_version import BUMP_FEED_VERSION_QUERY
+from services.metrics import ingest_stage, INGEST_FEEDS, INGEST_ARTICLES
+from services.profiler import SamplingProfiler, profile_path
+from services.feed_schedule import (
+    FeedState, DUE_FEEDS_QUERY, MAX_ENTRIES_PER_POLL, MAX_ENTRY_ATTEMPTS,
+    ENTRY_FAILURES_QUERY, RECORD_ENTRY_FAILURE_QUERY, CLEAR_ENTRY_FAILURE_QUERY
+)
+from services.partitions import ensure_partitions
 from transformers import pipeline, BartTokenizer
 from newspaper import Article
 from typing import Optional
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 
 app = Flask(__name__)
 
@@ -176,6 +186,12 @@ def get_article_text(url: str, entry: dict = None) -> Optional[str]:
         print(f"BeautifulSoup extraction failed: {e}")
         return None
 
+def estimate_read_time(text: Optional[str], words_per_minute: int = 200) -> int:
+    """Estimate reading time in whole minutes from the article word count"""
+    if not text:
+        return 1
+    return max(1, round(len(text.split()) / words_per_minute))
+
 def truncate_text(text: str, tokenizer, max_tokens: int = 1024) -> str:
     """Truncate text to fit within the model's max token length"""
     tokens = tokenizer(text, truncation=True, max_length=max_tokens, return_tensors="pt")
@@ -203,7 +219,8 @@ def process_entities(text: str, ner_model) -> tuple:
         print(f"NER failed: {e}")
         return [], [], []
 
-def create_summary(text: str, link: str, summarizer, tokenizer, entry: dict = None) -> str:
+def create_summary(text: str, link: str, summarizer, tokenizer, entry: dict = None,
+                   article_text: Optional[str] = None) -> str:
     """Create summary aiming for 6-15 lines (60-225 words), ensuring larger size"""
     if not link:
         return "No summary available"
@@ -214,7 +231,8 @@ def create_summary(text: str, link: str, summarizer, tokenizer, entry: dict = No
     # Always use full article text for summarization to ensure enough content
     cleaned_text = None
     if link:
-        article_text = get_article_text(link, entry)
+        if article_text is None:
+            article_text = get_article_text(link, entry)
         if article_text:
             print(f"📝 Fetched full article text for summary from {link[:60]}...")
             cleaned_text = BeautifulSoup(article_text, 'html.parser').get_text()
@@ -270,51 +288,89 @@ def create_summary(text: str, link: str, summarizer, tokenizer, entry: dict = No
         return cleaned_text[:225] + "..." if len(cleaned_text.split()) > 225 else cleaned_text
 
 # ========== MAIN FUNCTION ==========
-def fetch_and_process_news():
-    print("⚙️ Loading AI models...")
-    try:
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-        tokenizer = BartTokenizer.from_pretrained("facebook/bart-large-cnn")
-        sentiment_classifier = pipeline(
-            "text-classification", 
-            model="nlptown/bert-base-multilingual-uncased-sentiment"
-        )
-        ner_model = pipeline(
-            "ner", 
-            model="dslim/bert-base-NER", 
-            aggregation_strategy="simple"
-        )
-    except Exception as e:
-        print(f"❌ Failed to load models: {e}")
-        return {"status": "error", "message": f"Failed to load models: {e}"}
-
+def fetch_and_process_news(profile: bool = False, force: bool = False):
+    """Poll every feed that is due (all feeds with force=True)
+
+    With profile=True and INGEST_PROFILE_DIR set, also dump a flame-graph profile of the run.
+    """
+    profile_dir = os.getenv("INGEST_PROFILE_DIR")
+    if not (profile and profile_dir):
+        return _fetch_and_process_news(force)
+
+    with SamplingProfiler() as profiler:
+        result = _fetch_and_process_news(force)
+    path = profiler.write_folded(profile_path(profile_dir, "ingest"))
+    print(f"🔥 Wrote ingest profile to {path}")
+    return result
+
+def _fetch_and_process_news(force: bool = False):
     print("📊 Fetching feed URLs and categories from database...")
     conn = get_db_connection()
     cur = conn.cursor()
     
     try:
-        # Query with type casting to handle text = uuid mismatch
-        cur.execute("""
-            SELECT fu.feed_url, fu.category_id, c.title AS category_title 
-            FROM feed_urls fu
-            LEFT JOIN categories c ON fu.category_id::uuid = c.id
-        """)
+        # Only feeds whose next poll is due; type casting handles the text = uuid mismatch
+        cur.execute(DUE_FEEDS_QUERY, {"force": force})
         feed_urls = cur.fetchall()
         
         if not feed_urls:
-            print("ℹ️ No feed URLs found in database")
-            return {"status": "info", "message": "No feed URLs found in database"}
+            print("ℹ️ No feeds due for polling")
+            return {"status": "info", "message": "No feeds due for polling"}
+
+        # Rows for a month without a partition would land in news_default
+        ensure_partitions(cur)
+        conn.commit()
+
+        print("⚙️ Loading AI models...")
+        try:
+            with ingest_stage("model_load"):
+                summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+                tokenizer = BartTokenizer.from_pretrained("facebook/bart-large-cnn")
+                sentiment_classifier = pipeline(
+                    "text-classification", 
+                    model="nlptown/bert-base-multilingual-uncased-sentiment"
+                )
+                ner_model = pipeline(
+                    "ner", 
+                    model="dslim/bert-base-NER", 
+                    aggregation_strategy="simple"
+                )
+        except Exception as e:
+            print(f"❌ Failed to load models: {e}")
+            return {"status": "error", "message": f"Failed to load models: {e}"}
 
         total_processed = 0
-        two_days_ago = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=2)
 
-        for feed_url, category_id, category_title in feed_urls:
+        for feed_url, category_id, category_title, *state_columns in feed_urls:
+            state = FeedState(feed_url, *state_columns)
             try:
                 print(f"\n🔍 Processing feed: {feed_url[:60]}... (Category: {category_title or 'Unknown'})")
-                feed = feedparser.parse(feed_url)
+                now = datetime.datetime.now(datetime.timezone.utc)
+                with ingest_stage("feed_fetch"):
+                    feed = feedparser.parse(feed_url, etag=state.etag, modified=state.modified)
+
+                if feed.get('status') == 304:
+                    print(f"💤 Feed not modified since last poll")
+                    INGEST_FEEDS.labels("not_modified").inc()
+                    state.record_not_modified()
+                    state.save(cur)
+                    conn.commit()
+                    continue
+
+                # The new validators are only saved once every new entry is stored,
+                # otherwise the next poll would get a 304 and never retry the rest
+                validators = (feed.get('etag'), feed.get('modified'))
                 
                 if not feed.entries:
                     print(f"⚠️ No entries found in feed")
+                    INGEST_FEEDS.labels("empty").inc()
+                    if feed.get('bozo'):
+                        state.record_failure()
+                    else:
+                        state.etag, state.modified = validators
+                        state.record_poll([], [], False)
+                    state.save(cur)
+                    conn.commit()
                     continue
 
                 # Log channel metadata
@@ -325,101 +381,160 @@ def fetch_and_process_news():
                       f"Last Build Date: {feed.feed.get('lastbuilddate', 'N/A')}, "
                       f"Generator: {feed.feed.get('generator', 'N/A')}")
 
-                # Filter and sort entries by published date (latest first)
-                recent_entries = []
-                for entry in feed.entries:
-                    published_at = datetime.datetime.now(datetime.timezone.utc)
-                    if hasattr(entry, 'published'):
-                        try:
-                            published_at = datetime.datetime.strptime(
-                                entry.published, 
-                                '%a, %d %b %Y %H:%M:%S %z'
-                            )
-                        except ValueError:
-                            continue
-                    
-                    # Skip entries older than 2 days
-                    if published_at < two_days_ago:
-                        continue
-                    
-                    recent_entries.append((published_at, entry))
-                
-                # Sort by published date (descending) and take the latest 5
-                recent_entries.sort(key=lambda x: x[0], reverse=True)
-                recent_entries = [entry for _, entry in recent_entries[:5]]
+                with ingest_stage("entry_filter"):
+                    # Everything newer than the feed's high-water mark, oldest first
+                    recent_entries = state.new_entries(feed.entries, now)
+
+                    # Skip links we already stored (undated entries reappear on every poll)
+                    links = [getattr(entry, 'link', '') for _, entry in recent_entries]
+                    cur.execute('SELECT link FROM news_links WHERE link = ANY(%s)', (links,))
+                    known_links = set(row[0] for row in cur.fetchall())
+                    # Publish times already stored, these may advance the high-water mark
+                    ingested = [published_at for published_at, entry in recent_entries
+                                if published_at and getattr(entry, 'link', '') in known_links]
+                    recent_entries = [(published_at, entry) for published_at, entry in recent_entries
+                                      if getattr(entry, 'link', '') not in known_links]
+
+                    # Entries that failed too often are given up: settled like stored ones,
+                    # so they stop holding back the high-water mark and validators
+                    cur.execute(ENTRY_FAILURES_QUERY, (links,))
+                    failed_attempts = dict(cur.fetchall())
+                    given_up = {link for link, attempts in failed_attempts.items() if attempts >= MAX_ENTRY_ATTEMPTS}
+                    ingested += [published_at for published_at, entry in recent_entries
+                                 if published_at and getattr(entry, 'link', '') in given_up]
+                    recent_entries = [(published_at, entry) for published_at, entry in recent_entries
+                                      if getattr(entry, 'link', '') not in given_up]
+                    # Entries past the cap are left for the next poll
+                    deferred = recent_entries[MAX_ENTRIES_PER_POLL:]
+                    recent_entries = recent_entries[:MAX_ENTRIES_PER_POLL]
 
                 if not recent_entries:
-                    print(f"⚠️ No recent entries (within 2 days) found in feed")
+                    print(f"⚠️ No new entries since last poll")
+                    INGEST_FEEDS.labels("stale").inc()
+                    state.etag, state.modified = validators
+                    state.record_poll(feed.entries, ingested, False)
+                    state.save(cur)
+                    conn.commit()
                     continue
 
-                for entry in recent_entries:
+                # Publish times of new entries that are not stored yet (None if undated)
+                unstored = [published_at for published_at, _ in deferred]
+                for feed_published_at, entry in recent_entries:
                     try:
                         # Extract and clean fields
                         title = getattr(entry, 'title', 'No title').strip()
                         link = getattr(entry, 'link', '')
-                        description = clean_description(entry, link)
+                        with ingest_stage("description_scrape"):
+                            description = clean_description(entry, link)
                         
-                        published_at = datetime.datetime.now()
-                        if hasattr(entry, 'published'):
-                            try:
-                                published_at = datetime.datetime.strptime(
-                                    entry.published, 
-                                    '%a, %d %b %Y %H:%M:%S %z'
-                                )
-                            except ValueError:
-                                pass
+                        # Undated entries are stamped with the poll time but do not move the high-water mark
+                        dated = feed_published_at is not None
+                        published_at = feed_published_at or now
 
                         source = feed_url.split('/')[2]  # Extract domain
                         image_url = None
                         if hasattr(entry, 'media_content') and entry.media_content:
                             image_url = entry.media_content[0].get('url')
 
+                        # Fetch the article once, for both the summary and the read time
+                        with ingest_stage("article_extraction"):
+                            article_text = get_article_text(link, entry) if link else None
+                        read_time = estimate_read_time(article_text or description)
+
                         # AI Processing
-                        summary_text = create_summary(description, link, summarizer, tokenizer, entry)
-                        sentiment_label, sentiment_score = process_sentiment(title, sentiment_classifier)
+                        with ingest_stage("summarize"):
+                            summary_text = create_summary(description, link, summarizer, tokenizer, entry, article_text)
+                        with ingest_stage("sentiment"):
+                            sentiment_label, sentiment_score = process_sentiment(title, sentiment_classifier)
                         # Use summary_text for NER instead of description
-                        persons, organizations, locations = process_entities(summary_text, ner_model)
+                        with ingest_stage("ner"):
+                            persons, organizations, locations = process_entities(summary_text, ner_model)
 
-                        # Database insertion
+                        # Database insertion; news is partitioned, so the link is claimed in news_links
+                        # first and the article is only inserted if the claim succeeded
                         insert_query = """
+                        WITH claimed AS (
+                            INSERT INTO news_links (link, published_at) VALUES (%s, %s)
+                            ON CONFLICT (link) DO NOTHING
+                            RETURNING 1
+                        )
                         INSERT INTO news 
                         (title, description, summary, sentiment_label, sentiment_score, 
                          category, published_at, source, link, image_url, 
-                         persons, organizations, locations, read_time, popularity, "categoryId")
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (link) DO NOTHING;
+                         persons, organizations, locations, read_time, popularity, hot_score, "categoryId")
+                        SELECT %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                        FROM claimed;
                         """
 
-                        cur.execute(insert_query, (
-                            title,
-                            description,
-                            summary_text,
-                            sentiment_label,
-                            sentiment_score,
-                            category_title or "General",  # Use the category title from the database
-                            published_at,
-                            source,
-                            link,
-                            image_url,
-                            ', '.join(persons) if persons else None,
-                            ', '.join(organizations) if organizations else None,
-                            ', '.join(locations) if locations else None,
-                            2,  # read_time
-                            0,  # popularity
-                            category_id
-                        ))
-                        conn.commit()
+                        with ingest_stage("db_write"):
+                            cur.execute(insert_query, (
+                                link,
+                                published_at,
+                                title,
+                                description,
+                                summary_text,
+                                sentiment_label,
+                                sentiment_score,
+                                category_title or "General",  # Use the category title from the database
+                                published_at,
+                                source,
+                                link,
+                                image_url,
+                                ', '.join(persons) if persons else None,
+                                ', '.join(organizations) if organizations else None,
+                                ', '.join(locations) if locations else None,
+                                read_time,
+                                0,  # popularity
+                                hot_score(0, published_at),
+                                category_id
+                            ))
+                            if cur.rowcount:
+                                # A new article changes the feeds, expire their ETags
+                                cur.execute(BUMP_FEED_VERSION_QUERY)
+                            if link in failed_attempts:
+                                cur.execute(CLEAR_ENTRY_FAILURE_QUERY, (link,))
+                            conn.commit()
                         total_processed += 1
+                        if dated:
+                            ingested.append(published_at)
+                        INGEST_ARTICLES.labels("saved").inc()
                         print(f"✅ Saved: {title[:60]}... (Published: {published_at})")
 
                     except Exception as entry_error:
                         print(f"❌ Entry processing failed: {str(entry_error)[:100]}...")
+                        INGEST_ARTICLES.labels("failed").inc()
+                        conn.rollback()
+                        cur.execute(RECORD_ENTRY_FAILURE_QUERY, {
+                            "link": getattr(entry, 'link', ''),
+                            "feed_url": feed_url,
+                            "error": str(entry_error).replace('\x00', '')[:500],
+                        })
+                        attempts = cur.fetchone()[0]
+                        conn.commit()
+                        if attempts >= MAX_ENTRY_ATTEMPTS:
+                            print(f"🚫 Giving up on entry after {attempts} failed attempts")
+                            if feed_published_at:
+                                ingested.append(feed_published_at)
+                        else:
+                            unstored.append(feed_published_at)
                         continue
 
-                print(f"✔️ Finished processing 5 recent articles from {feed_url[:60]}")
+                if not unstored:
+                    state.etag, state.modified = validators
+                state.record_poll(feed.entries, ingested, True, unstored, backlog=bool(deferred))
+                state.save(cur)
+                conn.commit()
+                print(f"✔️ Finished processing {len(recent_entries)} new articles from {feed_url[:60]} "
+                      f"({len(deferred)} left for the next poll, next poll in {int(state.poll_interval // 60)} min)")
+                INGEST_FEEDS.labels("ok").inc()
 
             except Exception as feed_error:
                 print(f"🚨 Feed processing failed: {str(feed_error)[:100]}...")
+                INGEST_FEEDS.labels("failed").inc()
+                conn.rollback()
+                state.record_failure()
+                state.save(cur)
+                conn.commit()
                 continue
 
         print(f"\n🎉 Finished! Processed {total_processed} articles from {len(feed_urls)} feeds")
@@ -436,7 +551,8 @@ def fetch_and_process_news():
 @app.route('/api/fetch-news', methods=['GET'])
 def fetch_news():
     print("🔥 Fetching news...")
-    result = fetch_and_process_news()
+    result = fetch_and_process_news(profile=request.args.get("profile") == "1",
+                                    force=request.args.get("force") == "1")
     return jsonify(result)
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+# services/engagement.py
+# In-memory buffer for view/click events, flushed to the news table in bulk
+import atexit
+import math
+import os
+import threading
+import uuid
+from collections import defaultdict
+
+import psycopg2.extras
+from config.db import get_db_connection
+from services.feed_version import BUMP_FEED_VERSION_QUERY
+
+# A click is a stronger signal than a view
+CLICK_WEIGHT = 5
+
+# Seconds of recency worth one e-fold of popularity (~12.5h, as in the Reddit "hot" rank)
+POPULARITY_DECAY_SECONDS = 45000
+
+FLUSH_INTERVAL = float(os.getenv("ENGAGEMENT_FLUSH_INTERVAL", 10))
+FLUSH_THRESHOLD = int(os.getenv("ENGAGEMENT_FLUSH_THRESHOLD", 500))
+
+EVENT_TYPES = ("view", "click")
+MAX_EVENTS_PER_BATCH = 1000
+
+# Add the aggregated increments of every article in one statement
+FLUSH_QUERY = f"""
+    UPDATE news AS n
+    SET views = n.views + v.views,
+        clicks = n.clicks + v.clicks,
+        popularity = n.popularity + v.views + {CLICK_WEIGHT} * v.clicks,
+        hot_score = LN(GREATEST(n.popularity + v.views + {CLICK_WEIGHT} * v.clicks, 1))
+                    + EXTRACT(EPOCH FROM n.published_at) / {POPULARITY_DECAY_SECONDS}
+    FROM (VALUES %s) AS v(news_id, views, clicks)
+    WHERE n.id = v.news_id
+"""
+
+
+def parse_events(data) -> tuple:
+    """Validate an /events request body, returns (batch, error message)
+
+    batch is a list of (news_id, event_type) pairs; it is None when the body is invalid.
+    """
+    # Expecting a list of {"newsId": ..., "type": "view" | "click"}
+    events = data.get("events") if isinstance(data, dict) else None
+    if not isinstance(events, list) or not events:
+        return None, "Invalid input: events (non-empty list) is required"
+
+    if len(events) > MAX_EVENTS_PER_BATCH:
+        return None, f"Too many events: at most {MAX_EVENTS_PER_BATCH} per batch"
+
+    batch = []
+    for event in events:
+        news_id = event.get("newsId") if isinstance(event, dict) else None
+        event_type = event.get("type") if isinstance(event, dict) else None
+        if not news_id or not _is_uuid(str(news_id)) or event_type not in EVENT_TYPES:
+            return None, f"Invalid event: {event}"
+        batch.append((str(news_id), event_type))
+    return batch, None
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+        return True
+    except ValueError:
+        return False
+
+
+def hot_score(popularity: int, published_at) -> float:
+    """Decayed popularity score, kept in sync with the SQL in FLUSH_QUERY"""
+    return math.log(max(popularity, 1)) + published_at.timestamp() / POPULARITY_DECAY_SECONDS
+
+
+class EngagementBuffer:
+    """Aggregates events per article and writes them as counter increments"""
+
+    def __init__(self, interval: float = FLUSH_INTERVAL, threshold: int = FLUSH_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._counts = defaultdict(lambda: [0, 0])  # news_id -> [views, clicks]
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    def add(self, events: list) -> int:
+        """Buffer a batch of (news_id, event_type) pairs, returns how many were accepted"""
+        with self._lock:
+            for news_id, event_type in events:
+                self._counts[news_id][EVENT_TYPES.index(event_type)] += 1
+            pending = len(self._counts)
+            self._schedule()
+
+        if pending >= self.threshold:
+            self.flush()
+        return len(events)
+
+    def flush(self) -> int:
+        """Write all pending increments in a single UPDATE, returns the number of rows sent"""
+        with self._flush_lock:
+            with self._lock:
+                counts, self._counts = self._counts, defaultdict(lambda: [0, 0])
+            if not counts:
+                return 0
+
+            rows = [(news_id, views, clicks) for news_id, (views, clicks) in counts.items()]
+            conn = None
+            try:
+                conn = get_db_connection()
+                cur = conn.cursor()
+                psycopg2.extras.execute_values(
+                    cur, FLUSH_QUERY, rows,
+                    template="(%s::uuid, %s, %s)", page_size=len(rows)
+                )
+                # New counters reorder the popular feed, expire the feed ETags
+                cur.execute(BUMP_FEED_VERSION_QUERY)
+                conn.commit()
+                cur.close()
+                print(f"📈 Flushed engagement for {len(rows)} articles")
+                return len(rows)
+            except Exception as e:
+                # Put the increments back so the next flush retries them
+                print(f"❌ Engagement flush failed: {e}")
+                with self._lock:
+                    for news_id, views, clicks in rows:
+                        self._counts[news_id][0] += views
+                        self._counts[news_id][1] += clicks
+                return 0
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _schedule(self):
+        # Called with self._lock held
+        if self._timer is None:
+            self._timer = threading.Timer(self.interval, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+        with self._lock:
+            if self._counts:
+                self._schedule()
+
+
+engagement_buffer = EngagementBuffer()
+atexit.register(engagement_buffer.flush)
@@ -0,0 +1,183 @@
+# services/feed_schedule.py
+# Per-feed polling state: high-water marks, learned publish rate and backoff
+import calendar
+import datetime
+import statistics
+from typing import Optional
+
+from dateutil import parser as date_parser
+
+MIN_POLL_SECONDS = 5 * 60
+MAX_POLL_SECONDS = 6 * 60 * 60
+DEFAULT_POLL_SECONDS = 30 * 60
+# Poll about twice per expected new entry
+POLL_FRACTION = 0.5
+# Weight of the newest observation in the publish-interval moving average
+RATE_SMOOTHING = 0.3
+QUIET_BACKOFF = 1.5
+# A feed seen for the first time only contributes entries from this window
+NEW_FEED_WINDOW = datetime.timedelta(days=2)
+# Upper bound on entries ingested from one feed in one poll
+MAX_ENTRIES_PER_POLL = 50
+# Failed attempts after which an entry is given up and no longer retried
+MAX_ENTRY_ATTEMPTS = 3
+
+DUE_FEEDS_QUERY = """
+    SELECT fu.feed_url, fu.category_id, c.title AS category_title,
+           fs.high_water_mark, fs.publish_interval_seconds, fs.poll_interval_seconds,
+           fs.consecutive_failures, fs.etag, fs.modified
+    FROM feed_urls fu
+    LEFT JOIN categories c ON fu.category_id::uuid = c.id
+    LEFT JOIN feed_state fs ON fs.feed_url = fu.feed_url
+    WHERE %(force)s OR fs.next_poll_at IS NULL OR fs.next_poll_at <= now()
+    ORDER BY fs.next_poll_at NULLS FIRST
+"""
+
+SAVE_STATE_QUERY = """
+    INSERT INTO feed_state
+        (feed_url, high_water_mark, publish_interval_seconds, poll_interval_seconds,
+         consecutive_failures, etag, modified, last_polled_at, next_poll_at)
+    VALUES (%(feed_url)s, %(high_water_mark)s, %(publish_interval)s, %(poll_interval)s,
+            %(failures)s, %(etag)s, %(modified)s, now(), now() + make_interval(secs => %(poll_interval)s))
+    ON CONFLICT (feed_url) DO UPDATE SET
+        high_water_mark = EXCLUDED.high_water_mark,
+        publish_interval_seconds = EXCLUDED.publish_interval_seconds,
+        poll_interval_seconds = EXCLUDED.poll_interval_seconds,
+        consecutive_failures = EXCLUDED.consecutive_failures,
+        etag = EXCLUDED.etag,
+        modified = EXCLUDED.modified,
+        last_polled_at = EXCLUDED.last_polled_at,
+        next_poll_at = EXCLUDED.next_poll_at
+"""
+
+
+ENTRY_FAILURES_QUERY = "SELECT link, attempts FROM feed_entry_failures WHERE link = ANY(%s)"
+
+RECORD_ENTRY_FAILURE_QUERY = """
+    INSERT INTO feed_entry_failures (link, feed_url, last_error)
+    VALUES (%(link)s, %(feed_url)s, %(error)s)
+    ON CONFLICT (link) DO UPDATE SET
+        attempts = feed_entry_failures.attempts + 1,
+        last_error = EXCLUDED.last_error,
+        last_failed_at = now()
+    RETURNING attempts
+"""
+
+CLEAR_ENTRY_FAILURE_QUERY = "DELETE FROM feed_entry_failures WHERE link = %s"
+
+
+def parse_published(entry) -> Optional[datetime.datetime]:
+    """Publish time of a feed entry as an aware UTC datetime, or None if it has none
+
+    feedparser already normalises RFC 822, ISO 8601 and most other feed date formats
+    into *_parsed; dateutil handles whatever it could not.
+    """
+    for field in ("published_parsed", "updated_parsed"):
+        parsed = entry.get(field)
+        if parsed:
+            return datetime.datetime.fromtimestamp(calendar.timegm(parsed), datetime.timezone.utc)
+
+    for field in ("published", "updated"):
+        text = entry.get(field)
+        if not text:
+            continue
+        try:
+            published_at = date_parser.parse(text)
+        except (ValueError, OverflowError):
+            continue
+        if published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=datetime.timezone.utc)
+        return published_at.astimezone(datetime.timezone.utc)
+
+    return None
+
+
+def _clamp(seconds: float) -> float:
+    return max(MIN_POLL_SECONDS, min(MAX_POLL_SECONDS, seconds))
+
+
+class FeedState:
+    """What we know about one feed between polls, persisted in the feed_state table"""
+
+    def __init__(self, feed_url: str, high_water_mark=None, publish_interval=None,
+                 poll_interval=None, failures: int = 0, etag=None, modified=None):
+        self.feed_url = feed_url
+        self.high_water_mark = high_water_mark
+        self.publish_interval = publish_interval
+        self.poll_interval = poll_interval or DEFAULT_POLL_SECONDS
+        self.failures = failures or 0
+        self.etag = etag
+        self.modified = modified
+
+    def new_entries(self, entries: list, now: datetime.datetime) -> list:
+        """(published_at, entry) pairs newer than the high-water mark, oldest first
+
+        Dates in the future are clamped to now. Undated entries are always returned, last and
+        with published_at None; callers dedupe them by link. Callers capping a poll at
+        MAX_ENTRIES_PER_POLL keep the head of the list, so the high-water mark never passes
+        entries that were left for the next poll.
+        """
+        cutoff = self.high_water_mark or now - NEW_FEED_WINDOW
+        fresh = []
+        for entry in entries:
+            published_at = parse_published(entry)
+            if published_at is not None:
+                # Future dates would land outside the pre-created news partitions and
+                # push the high-water mark past entries still to come
+                published_at = min(published_at, now)
+            if published_at is None or published_at > cutoff:
+                fresh.append((published_at, entry))
+        fresh.sort(key=lambda pair: pair[0] or now)
+        return fresh
+
+    def record_poll(self, entries: list, stored: list, found_new: bool, unstored: list = (),
+                    backlog: bool = False):
+        """Learn from a successful poll and schedule the next one
+
+        entries are all entries in the feed, stored the publish times now in the news table and
+        unstored those of new entries that failed or were left for later. The high-water mark
+        only moves up to the newest stored entry below every unstored one; with backlog the
+        feed is polled again soon.
+        """
+        self.failures = 0
+        dated = sorted(filter(None, (parse_published(entry) for entry in entries)))
+        gaps = [(b - a).total_seconds() for a, b in zip(dated, dated[1:]) if b > a]
+        if gaps:
+            observed = statistics.median(gaps)
+            if self.publish_interval:
+                observed = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * self.publish_interval
+            self.publish_interval = observed
+
+        pending = [published_at for published_at in unstored if published_at]
+        oldest_pending = min(pending) if pending else None
+        settled = [published_at for published_at in stored
+                   if oldest_pending is None or published_at < oldest_pending]
+        if settled:
+            self.high_water_mark = max(settled + ([self.high_water_mark] if self.high_water_mark else []))
+
+        if backlog:
+            self.poll_interval = MIN_POLL_SECONDS
+        elif found_new:
+            self.poll_interval = _clamp((self.publish_interval or DEFAULT_POLL_SECONDS) * POLL_FRACTION)
+        else:
+            # Nothing new: stretch the interval until the feed shows signs of life
+            self.poll_interval = _clamp(self.poll_interval * QUIET_BACKOFF)
+
+    def record_not_modified(self):
+        self.failures = 0
+        self.poll_interval = _clamp(self.poll_interval * QUIET_BACKOFF)
+
+    def record_failure(self):
+        self.failures += 1
+        self.poll_interval = _clamp(MIN_POLL_SECONDS * 2 ** self.failures)
+
+    def save(self, cur):
+        cur.execute(SAVE_STATE_QUERY, {
+            "feed_url": self.feed_url,
+            "high_water_mark": self.high_water_mark,
+            "publish_interval": self.publish_interval,
+            "poll_interval": self.poll_interval,
+            "failures": self.failures,
+            "etag": self.etag,
+            "modified": self.modified,
+        })
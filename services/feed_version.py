@@ -0,0 +1,27 @@
+# services/feed_version.py
+# Cheap validator for the feed endpoints, checked before the feed query runs
+import hashlib
+
+from services.partitions import FEED_WINDOW_DAYS, FEED_WINDOW_PREDICATE
+
+# Run in the same transaction as every write that changes feed rows
+BUMP_FEED_VERSION_QUERY = "SELECT nextval('news_feed_version')"
+
+# {where} narrows to the user's categories; the newest publish time also catches inserts
+# from writers that do not bump the version. last_value of an unused sequence already holds
+# its start value, so it only counts once is_called is set by the first bump.
+FEED_VERSION_QUERY = """
+    SELECT (SELECT CASE WHEN is_called THEN last_value END FROM news_feed_version), max(n.published_at)
+    FROM news n
+    WHERE """ + FEED_WINDOW_PREDICATE + """{where}
+"""
+
+
+def feed_validator(version, newest, sort: str, category_ids) -> str:
+    """ETag base of one feed response; category_ids is None for the anonymous feed
+
+    Anonymous and no-preference feeds carry different messages, so [] and None differ.
+    """
+    scope = "*" if category_ids is None else ",".join(sorted(category_ids))
+    key = f"{version}|{newest.isoformat() if newest else ''}|{sort}|{FEED_WINDOW_DAYS}|{scope}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
@@ -0,0 +1,92 @@
+# services/metrics.py
+# Prometheus metrics for the ingest pipeline and per-route database time
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess, REGISTRY
+)
+
+# Ingest stages run from milliseconds (feed filter) to tens of seconds (BART on CPU)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+INGEST_STAGE_SECONDS = Histogram(
+    "ingest_stage_seconds", "Time spent in each stage of fetch_and_process_news",
+    ["stage"], buckets=STAGE_BUCKETS
+)
+INGEST_FEEDS = Counter(
+    "ingest_feeds_total", "Feeds polled by the ingest job, by outcome", ["outcome"]
+)
+INGEST_ARTICLES = Counter(
+    "ingest_articles_total", "Feed entries processed by the ingest job, by outcome", ["outcome"]
+)
+ROUTE_DB_SECONDS = Histogram(
+    "route_db_seconds", "Database time spent per request, by route", ["route"], buckets=DB_BUCKETS
+)
+ROUTE_DB_STATEMENTS = Counter(
+    "route_db_statements_total", "Statements executed while serving requests, by route", ["route"]
+)
+
+
+@contextmanager
+def ingest_stage(stage: str):
+    """Time a block as one observation of the given ingest stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        INGEST_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def render_metrics() -> tuple:
+    """Exposition body and content type, aggregated across workers in multiprocess mode"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_app(app):
+    """Expose /metrics and record each request's database time (see config.db.TimedCursor)"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def start_db_timer():
+        g.db_seconds = 0.0
+        g.db_statements = 0
+
+    @app.teardown_request
+    def record_db_time(exc=None):
+        if request.endpoint and g.get("db_statements"):
+            ROUTE_DB_SECONDS.labels(request.endpoint).observe(g.db_seconds)
+            ROUTE_DB_STATEMENTS.labels(request.endpoint).inc(g.db_statements)
+
+    @app.route("/metrics")
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
+
+
+def init_asgi_app(app):
+    """Quart counterpart of init_app, database time comes from config.async_db.TimedPool"""
+    from quart import Response, g, request
+
+    @app.before_request
+    async def start_db_timer():
+        g.db_seconds = 0.0
+        g.db_statements = 0
+
+    @app.teardown_request
+    async def record_db_time(exc=None):
+        if request.endpoint and g.get("db_statements"):
+            ROUTE_DB_SECONDS.labels(request.endpoint).observe(g.db_seconds)
+            ROUTE_DB_STATEMENTS.labels(request.endpoint).inc(g.db_statements)
+
+    @app.route("/metrics")
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
@@ -0,0 +1,67 @@
+# services/partitions.py
+# Monthly partitions of the news table (see migrations/003_partition_news.sql)
+import datetime
+import os
+
+# Feeds only read this far back, which lets Postgres prune to the newest partitions
+FEED_WINDOW_DAYS = int(os.getenv("FEED_WINDOW_DAYS", "30"))
+FEED_WINDOW_PREDICATE = f"n.published_at > now() - interval '{FEED_WINDOW_DAYS} days'"
+
+ENSURE_PARTITIONS_QUERY = "SELECT ensure_news_partitions(date_trunc('month', now())::date, %s)"
+
+# Monthly partitions currently attached to news, oldest first
+ATTACHED_PARTITIONS_QUERY = """
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'news'::regclass AND c.relname ~ '^news_p[0-9]{6}$'
+    ORDER BY c.relname
+"""
+
+
+def partition_month(name: str) -> datetime.date:
+    return datetime.datetime.strptime(name[len("news_p"):], "%Y%m").date()
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_partitions(cur, months_ahead: int = 2) -> int:
+    """Create partitions up to months_ahead months after the current one, returns how many were new"""
+    cur.execute(ENSURE_PARTITIONS_QUERY, (months_ahead,))
+    return cur.fetchone()[0]
+
+
+def archive_partitions(cur, retain_months: int, today: datetime.date = None) -> list:
+    """Move partitions older than retain_months full months from news to news_archive
+
+    No rows are copied. A validated CHECK matching the month's bounds is added first, so
+    ATTACH PARTITION can skip its scan of the month; VALIDATE CONSTRAINT scans it under a
+    lock that still allows reads and writes. Rows in news_default are not archived. The links
+    stay in news_links, so archived articles are not ingested again.
+    """
+    today = today or datetime.date.today()
+    cutoff = add_months(today.replace(day=1), -retain_months)
+
+    cur.execute(ATTACHED_PARTITIONS_QUERY)
+    archived = []
+    for (name,) in cur.fetchall():
+        month = partition_month(name)
+        if month >= cutoff:
+            break
+        # Untyped literals become timestamptz constants like the partition bounds; a date
+        # parameter would be cast at run time and the CHECK would no longer imply the bounds
+        bounds = (month.isoformat(), add_months(month, 1).isoformat())
+        cur.execute(
+            f'ALTER TABLE "{name}" ADD CONSTRAINT "{name}_bounds" '
+            f'CHECK (published_at >= %s AND published_at < %s) NOT VALID',
+            bounds
+        )
+        cur.execute(f'ALTER TABLE "{name}" VALIDATE CONSTRAINT "{name}_bounds"')
+        cur.execute(f'ALTER TABLE news DETACH PARTITION "{name}"')
+        cur.execute(f'ALTER TABLE news_archive ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)', bounds)
+        cur.execute(f'ALTER TABLE "{name}" DROP CONSTRAINT "{name}_bounds"')
+        archived.append(name)
+    return archived
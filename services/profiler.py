@@ -0,0 +1,49 @@
+# services/profiler.py
+# Minimal sampling profiler producing collapsed stacks for flame graphs
+# (flamegraph.pl, speedscope and inferno all read the "frame;frame;frame count" format)
+import collections
+import os
+import sys
+import threading
+import time
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval from a background thread"""
+
+    def __init__(self, interval: float = 0.005, thread_id: int = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def __enter__(self):
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        return path
+
+
+def profile_path(directory: str, name: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.folded")
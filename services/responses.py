@@ -0,0 +1,107 @@
+# services/responses.py
+# JSON responses encoded with orjson, compressed on demand and validated with a strong ETag
+import datetime
+import decimal
+import gzip
+import hashlib
+import uuid
+
+import brotli
+import orjson
+from flask import Response, request
+from werkzeug.http import http_date
+
+# Bodies smaller than this are sent as-is, compressing them costs more than it saves
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _default(value):
+    """Match Flask's default JSON provider for the types orjson leaves to us"""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return http_date(value)
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    # orjson only encodes uuid.UUID itself, asyncpg returns a subclass
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def fetch_rows(cur) -> list:
+    """Read the remaining rows of a cursor as dicts keyed by column name
+
+    The feed's wire format is a list of objects with Flask-style HTTP dates, so rows stay
+    dicts here: json_agg in SQL would change the date format and needs explicit columns
+    instead of n.*, and orjson cannot encode a tuple as an object.
+    """
+    column_names = [desc[0] for desc in cur.description]
+    return [dict(zip(column_names, row)) for row in cur]
+
+
+def dumps(payload) -> bytes:
+    return orjson.dumps(payload, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+def render_json(payload, status: int, accept_encodings, if_none_match, method: str = "GET",
+                validator: str = None) -> tuple:
+    """Encode payload for a client, returns (body, status, headers)
+
+    Framework-neutral so the WSGI and ASGI apps send identical responses;
+    accept_encodings and if_none_match are the parsed werkzeug request headers.
+    Only GET and HEAD carry an ETag and are answered with 304. The ETag is built from
+    validator when the route computed one, otherwise from a hash of the body.
+    """
+    body = dumps(payload)
+    headers = {"Vary": "Accept-Encoding"}
+
+    encoding = None
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding = accept_encodings.best_match(["br", "gzip"])
+
+    if status == 200 and method in ("GET", "HEAD"):
+        # A strong validator names one exact representation, so it differs per content-coding
+        etag = (validator or hashlib.sha256(body).hexdigest()[:32]) + (f"-{encoding}" if encoding else "")
+        headers["ETag"] = f'"{etag}"'
+        if if_none_match.contains(etag):
+            return b"", 304, headers
+
+    headers["Content-Type"] = "application/json"
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+        headers["Content-Encoding"] = "br"
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+
+    return body, status, headers
+
+
+def render_not_modified(validator: str, accept_encodings, if_none_match, method: str):
+    """(body, 304, headers) when the client already holds the response tagged from validator, else None
+
+    Lets a route answer before building its payload. The tag sent by render_json is validator
+    plus the negotiated coding, or the bare validator for a body too small to compress.
+    """
+    if method not in ("GET", "HEAD"):
+        return None
+    encoding = accept_encodings.best_match(["br", "gzip"])
+    for etag in (validator, f"{validator}-{encoding}" if encoding else None):
+        if etag and if_none_match.contains(etag):
+            return b"", 304, {"Vary": "Accept-Encoding", "ETag": f'"{etag}"'}
+    return None
+
+
+def json_response(payload, status: int = 200, validator: str = None) -> Response:
+    """Serialize payload, answer conditional GET requests with 304 and compress for the client"""
+    body, status, headers = render_json(payload, status, request.accept_encodings, request.if_none_match,
+                                        request.method, validator)
+    return Response(body, status=status, headers=headers)
+
+
+def not_modified_response(validator: str):
+    """304 Response when the request's If-None-Match holds the feed tagged from validator, else None"""
+    rendered = render_not_modified(validator, request.accept_encodings, request.if_none_match, request.method)
+    return Response(rendered[0], status=304, headers=rendered[2]) if rendered else None
@@ -0,0 +1,257 @@
+# services/users.py
+# Single-statement user operations and an in-process cache of preferences and categories
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+
+from config.db import get_db_connection
+
+PREFERENCE_CACHE_SIZE = int(os.getenv("PREFERENCE_CACHE_SIZE", 10000))
+# Preference writes NOTIFY every worker (see PreferenceListener), the TTL is only a backstop
+PREFERENCE_CACHE_TTL = float(os.getenv("PREFERENCE_CACHE_TTL", 300))
+CATEGORY_CACHE_TTL = float(os.getenv("CATEGORY_CACHE_TTL", 300))
+
+# Statements are written once with {name} placeholders and rendered per driver by
+# render_query: %(name)s for psycopg2 (dict params), $n in PARAM_ORDER for asyncpg
+PARAM_ORDER = ("user_id", "preferences")
+
+CREATE_USER_QUERY = """
+    INSERT INTO users ("userId") VALUES ({user_id})
+    ON CONFLICT ("userId") DO NOTHING
+    RETURNING "userId"
+"""
+
+# target reads the pre-update snapshot, so one statement tells "not found", "updated" and "not new" apart
+UPDATE_STATUS_QUERY = """
+    WITH target AS (
+        SELECT "isNew" FROM users WHERE "userId" = {user_id}
+    ), updated AS (
+        UPDATE users SET "isNew" = FALSE
+        WHERE "userId" = {user_id} AND "isNew"
+        RETURNING 1
+    )
+    SELECT COALESCE("isNew", FALSE) FROM target
+"""
+
+# Channel of the NOTIFY sent by SET_PREFERENCES_QUERY, the payload is the userId
+PREFERENCES_CHANNEL = "preferences_changed"
+
+# Set-based diff: delete what is no longer wanted, insert what is missing, and only
+# when the user exists and every requested category is known. notified is delivered
+# to every worker's listener when the transaction commits.
+SET_PREFERENCES_QUERY = """
+    WITH requested AS (
+        SELECT DISTINCT unnest({preferences}::uuid[]) AS id
+    ), valid AS (
+        SELECT c.id FROM categories c JOIN requested r ON r.id = c.id
+    ), allowed AS (
+        SELECT 1 FROM users
+        WHERE "userId" = {user_id}
+          AND (SELECT count(*) FROM valid) = (SELECT count(*) FROM requested)
+    ), deleted AS (
+        DELETE FROM user_preferences up
+        WHERE up."userId" = {user_id}
+          AND EXISTS (SELECT 1 FROM allowed)
+          AND up."categoryId" NOT IN (SELECT id FROM valid)
+        RETURNING 1
+    ), inserted AS (
+        INSERT INTO user_preferences ("userId", "categoryId")
+        SELECT {user_id}, v.id FROM valid v
+        WHERE EXISTS (SELECT 1 FROM allowed)
+          AND NOT EXISTS (
+              SELECT 1 FROM user_preferences up
+              WHERE up."userId" = {user_id} AND up."categoryId" = v.id
+          )
+        RETURNING 1
+    ), notified AS (
+        SELECT pg_notify('preferences_changed', {user_id}) FROM allowed
+    )
+    SELECT EXISTS (SELECT 1 FROM users WHERE "userId" = {user_id}) AS user_exists,
+           ARRAY(SELECT r.id::text FROM requested r WHERE r.id NOT IN (SELECT id FROM valid)) AS invalid_ids
+    FROM (SELECT count(*) FROM notified) AS notify
+"""
+
+USER_PREFERENCES_QUERY = """
+    SELECT c.id::text
+    FROM user_preferences up
+    JOIN categories c ON up."categoryId" = c.id
+    WHERE up."userId" = {user_id}
+"""
+
+CATEGORY_IDS_QUERY = "SELECT id::text FROM categories"
+
+
+class LRUCache:
+    """Thread-safe LRU with a per-entry TTL
+
+    generation counts invalidations; pass the value read before a database lookup to set()
+    so a result that was invalidated while in flight is not cached.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, self._MISSING)
+            if item is self._MISSING:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, generation: int = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            self.generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+class PreferenceListener:
+    """Per-process LISTEN connection dropping the preference_cache entries any worker changed
+
+    The cache is only used while the listener is connected; it is cleared on (re)connect,
+    since notifications sent in between are lost.
+    """
+
+    RECONNECT_DELAY = 5.0
+    # Idle connections are pinged this often so a dead one is noticed
+    KEEPALIVE_INTERVAL = 30.0
+
+    def __init__(self, cache: LRUCache, connect=get_db_connection):
+        self.cache = cache
+        self.connect = connect
+        self.healthy = False
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        # Threads do not survive a fork, so every worker process starts its own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.healthy = False
+            threading.Thread(target=self._run, name="preference-listener", daemon=True).start()
+
+    def _run(self):
+        while True:
+            conn = None
+            try:
+                conn = self.connect()
+                conn.autocommit = True
+                cur = conn.cursor()
+                cur.execute(f"LISTEN {PREFERENCES_CHANNEL}")
+                self.cache.invalidate()
+                self.healthy = True
+                while True:
+                    if select.select([conn], [], [], self.KEEPALIVE_INTERVAL) == ([], [], []):
+                        cur.execute("SELECT 1")
+                    conn.poll()
+                    while conn.notifies:
+                        self.cache.invalidate(conn.notifies.pop(0).payload)
+            except Exception as e:
+                self.healthy = False
+                print(f"⚠️ Preference listener disconnected, cache bypassed: {e}")
+                if conn is not None:
+                    conn.close()
+                time.sleep(self.RECONNECT_DELAY)
+
+
+preference_cache = LRUCache(PREFERENCE_CACHE_SIZE, PREFERENCE_CACHE_TTL)
+preference_listener = PreferenceListener(preference_cache)
+category_cache = LRUCache(1, CATEGORY_CACHE_TTL)
+
+
+def render_query(query: str, driver: str = "psycopg2") -> str:
+    """Fill the {name} placeholders of one of the statements above for psycopg2 or asyncpg"""
+    if driver == "asyncpg":
+        return query.format(**{name: f"${i}" for i, name in enumerate(PARAM_ORDER, 1)})
+    return query.format(**{name: f"%({name})s" for name in PARAM_ORDER})
+
+
+def create_user(conn, user_id: str) -> bool:
+    """Insert the user, returns False if it already existed"""
+    with conn.cursor() as cur:
+        cur.execute(render_query(CREATE_USER_QUERY), {"user_id": user_id})
+        created = cur.fetchone() is not None
+    conn.commit()
+    return created
+
+
+def mark_user_not_new(conn, user_id: str):
+    """Clear the isNew flag, returns its previous value or None if the user does not exist"""
+    with conn.cursor() as cur:
+        cur.execute(render_query(UPDATE_STATUS_QUERY), {"user_id": user_id})
+        row = cur.fetchone()
+    conn.commit()
+    return row[0] if row else None
+
+
+def set_user_preferences(conn, user_id: str, preferences: list) -> tuple:
+    """Replace the user's preferences, returns (user_exists, invalid_category_ids)
+
+    Nothing is written unless the user exists and every category is valid.
+    """
+    with conn.cursor() as cur:
+        cur.execute(render_query(SET_PREFERENCES_QUERY), {"user_id": user_id, "preferences": preferences})
+        user_exists, invalid_ids = cur.fetchone()
+    conn.commit()
+    # Invalidate after the commit so a concurrent reader cannot re-cache the old set
+    preference_cache.invalidate(user_id)
+    return user_exists, invalid_ids
+
+
+def cached_preference_ids(user_id: str) -> tuple:
+    """(category IDs or None, generation); None also while the listener is down"""
+    preference_listener.ensure_started()
+    if not preference_listener.healthy:
+        return None, None
+    return preference_cache.get(user_id), preference_cache.generation
+
+
+def get_user_preference_ids(conn, user_id: str) -> list:
+    """Category IDs the user follows, served from the cache when possible"""
+    category_ids, generation = cached_preference_ids(user_id)
+    if category_ids is None:
+        with conn.cursor() as cur:
+            cur.execute(render_query(USER_PREFERENCES_QUERY), {"user_id": user_id})
+            category_ids = [row[0] for row in cur.fetchall()]
+        if generation is not None:
+            preference_cache.set(user_id, category_ids, generation)
+    return category_ids
+
+
+def get_category_ids(conn) -> frozenset:
+    """Every category ID, cached for CATEGORY_CACHE_TTL seconds"""
+    category_ids = category_cache.get("all")
+    if category_ids is None:
+        with conn.cursor() as cur:
+            cur.execute(CATEGORY_IDS_QUERY)
+            category_ids = frozenset(row[0] for row in cur.fetchall())
+        category_cache.set("all", category_ids)
+    return category_ids